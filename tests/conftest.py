@@ -0,0 +1,20 @@
+import importlib.util
+import os
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope='session')
+def game():
+    """The game module, loaded from word-guessing-game.py"""
+    spec = importlib.util.spec_from_file_location('word_guessing_game', os.path.join(ROOT, 'word-guessing-game.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope='session')
+def word_file():
+    return os.path.join(ROOT, 'words.csv')
@@ -0,0 +1,25 @@
+import random
+
+import pytest
+
+
+def lcs_length(a, b):
+    previous = [0] * (len(b) + 1)
+    for x in a:
+        row = [0]
+        for j, y in enumerate(b):
+            row.append(previous[j] + 1 if x == y else max(previous[j + 1], row[j]))
+        previous = row
+    return previous[-1]
+
+
+@pytest.mark.parametrize('threshold', [0, 50, 80, 100])
+def test_fuzzy_match_agrees_with_the_indel_ratio(game, threshold):
+    rng = random.Random(threshold)
+    for _ in range(3000):
+        # Long strings too, so the early exits are taken
+        guess = ''.join(rng.choice('abcde') for _ in range(rng.randint(0, 40)))
+        answer = ''.join(rng.choice('abcde') for _ in range(rng.randint(0, 40)))
+        total = len(guess) + len(answer)
+        score = 100 if guess == answer else round(200 * lcs_length(guess, answer) / total) if total else 0
+        assert game.fuzzy_match(guess, answer, threshold) == (score >= threshold), (guess, answer)
@@ -0,0 +1,15 @@
+def test_failed_background_load_finishes_with_an_error(game, tmp_path):
+    path = tmp_path / 'words.csv'
+    path.write_bytes(b'word,hint,neighbors\napple,a red fruit,pear\npear,\xff broken,apple\n')
+    bank = game.FileBFS(str(path), background=True)
+    assert bank.loaded.wait(5)
+    assert 'utf-8' in bank.load_error
+
+
+def test_background_load_has_no_error(game, word_file, tmp_path):
+    path = tmp_path / 'words.csv'
+    with open(word_file, 'rb') as f:
+        path.write_bytes(f.read())
+    bank = game.FileBFS(str(path), background=True)
+    assert bank.loaded.wait(5)
+    assert bank.load_error is None and bank.word_count() > 0
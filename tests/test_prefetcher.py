@@ -0,0 +1,66 @@
+import threading
+
+import pytest
+
+
+class GatedSource:
+    """Word source whose first word waits until the test opens the gate"""
+
+    def __init__(self, pairs):
+        self.pairs = pairs
+        self.gate = threading.Event()
+
+    def session(self, difficulty, exclude=()):
+        self.gate.wait(5)
+        yield from self.pairs
+
+
+def test_waiter_is_dispatched_without_holding_the_lock(game):
+    held = []
+    delivered = threading.Event()
+    got = []
+
+    def dispatch(fn):
+        # A threaded Tk blocks after() until the UI thread runs, and the UI thread takes this lock
+        free = prefetcher._lock.acquire(blocking=False)
+        held.append(not free)
+        if free:
+            prefetcher._lock.release()
+        fn()
+        delivered.set()
+
+    source = GatedSource([('wizard', 'a hint')])
+    prefetcher = game.WordPrefetcher(source, dispatch)
+    prefetcher.start('Easy')
+    assert not prefetcher.take(got.append)  # nothing ready yet, so the callback waits
+    source.gate.set()
+    assert delivered.wait(5)
+    prefetcher.shutdown()
+    assert got == [('wizard', 'a hint')]
+    assert held == [False]
+
+
+def test_plan_session_refuses_a_bank_that_cannot_fill_the_game(game, word_file, tmp_path):
+    path = tmp_path / 'words.csv'
+    with open(word_file, encoding='utf-8') as f:
+        path.write_text(''.join(f.readlines()[:6]), encoding='utf-8')
+    bank = game.FileBFS(str(path))
+    with pytest.raises(ValueError, match='10 needed'):
+        bank.plan_session('Easy', 10)
+
+
+def test_planned_words_are_handed_out_in_order(game):
+    got = []
+    received = threading.Semaphore(0)
+
+    def on_word(pair):
+        got.append(pair)
+        received.release()
+
+    prefetcher = game.WordPrefetcher(None, lambda fn: fn())
+    prefetcher.start('Easy', words=[('apple', 'a fruit'), ('pear', 'a green fruit')])
+    for _ in range(3):
+        prefetcher.take(on_word)
+        assert received.acquire(timeout=5)
+    prefetcher.shutdown()
+    assert got == [('apple', 'a fruit'), ('pear', 'a green fruit'), None]
@@ -0,0 +1,84 @@
+import pytest
+
+HEADER = 'word,hint,neighbors\n'
+ROWS = ['kite,flies on a string,pear;plum\n', 'pear,a green fruit,plum\n', 'plum,a purple fruit,pear\n']
+
+
+def view(index):
+    """{word: (hint, sorted neighbor words)} of every row in an index"""
+    limit = index.row_limit
+    return {index.word(i): (index.hint(i), sorted(index.word(n) for n in index.neighbors(i) if n < limit))
+            for i in index.row_ids()}
+
+
+def edit(rows, at, line):
+    """Rows with line inserted (at='insert:<k>'), row k removed ('delete:<k>') or replaced ('replace:<k>')"""
+    op, k = at.split(':')
+    rows = list(rows)
+    if op == 'insert':
+        rows.insert(int(k), line)
+    elif op == 'delete':
+        del rows[int(k)]
+    else:
+        rows[int(k)] = line
+    return rows
+
+
+@pytest.mark.parametrize('at, line', [
+    ('insert:0', 'apple,a red fruit,pear\n'),
+    ('insert:1', 'apple,a red fruit,pear\n'),
+    ('insert:3', 'apple,a red fruit,pear\n'),
+    ('delete:0', None),
+    ('delete:1', None),
+    ('delete:2', None),
+    ('replace:0', 'akite,flies on a string,pear;plum\n'),  # edit at the start of a line
+    ('replace:1', 'apear,a green fruit,plum\n'),
+    ('replace:1', 'pear,a ripe green fruit,plum\n'),  # edit in the middle
+    ('replace:2', 'plum,a purple fruit,pear;kite\n'),  # edit at the end
+    ('replace:2', 'plums,a purple fruit,pear\n'),
+])
+def test_reload_matches_a_fresh_compile(game, tmp_path, at, line):
+    path = tmp_path / 'words.csv'
+    path.write_text(HEADER + ''.join(ROWS))
+    bank = game.FileBFS(str(path))
+    bank.reload()  # the snapshot later reloads diff against
+    path.write_text(HEADER + ''.join(edit(ROWS, at, line)))
+    summary = bank.reload(rebuild_ratio=1.0)
+    assert not summary['full'], summary
+    fresh = game.WordIndex.build(str(path), index_path=str(tmp_path / 'fresh.idx'))
+    assert view(bank.index) == view(fresh)
+
+
+@pytest.mark.parametrize('at, line', [
+    ('insert:1', 'apple,a red fruit,pear\n'),
+    ('delete:1', None),
+    ('replace:2', 'plums,a purple fruit,pear\n'),
+])
+def test_patched_lookups_match_a_fresh_compile(game, tmp_path, at, line):
+    path = tmp_path / 'words.csv'
+    path.write_text(HEADER + ''.join(ROWS))
+    bank = game.FileBFS(str(path))
+    bank.reload()
+    bank.word_finder(), bank.buckets()  # built over the compiled bank, then patched
+    path.write_text(HEADER + ''.join(edit(ROWS, at, line)))
+    bank.reload(rebuild_ratio=1.0)
+    finder, buckets = bank.word_finder(), bank.buckets()
+    assert isinstance(bank.index, game._PatchedIndex)
+    fresh = game.WordIndex.build(str(path), index_path=str(tmp_path / 'fresh.idx'))
+    fresh_finder, fresh_buckets = game.WordFinder(fresh), game.WordBuckets(fresh)
+    for guess in ['apple', 'pear', 'plum', 'plums', 'kite', 'pea', 'xyz']:
+        assert finder.nearest(guess, 2, limit=10) == fresh_finder.nearest(guess, 2, limit=10), guess
+    rule = {'lengths': [3, 6]}
+    assert buckets.count(rule) == fresh_buckets.count(rule)
+    drawn = {buckets.index.word(i) for i in buckets.sample(rule)}
+    assert drawn == {fresh.word(i) for i in fresh_buckets.sample(rule)}
+
+
+def test_large_patch_reports_a_full_rebuild(game, tmp_path):
+    path = tmp_path / 'words.csv'
+    path.write_text(HEADER + ''.join(ROWS))
+    bank = game.FileBFS(str(path))
+    bank.reload()
+    path.write_text(HEADER + ''.join(ROWS) + 'apple,a red fruit,pear\n')
+    summary = bank.reload(rebuild_ratio=0.1)
+    assert summary['full'] and summary['rows'] == 4, summary
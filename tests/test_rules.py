@@ -0,0 +1,41 @@
+import json
+import shutil
+
+import pytest
+
+
+@pytest.fixture
+def bank(game, word_file, tmp_path):
+    path = tmp_path / 'words.csv'
+    shutil.copy(word_file, path)
+    return path
+
+
+def test_difficulty_rule_without_calibration_is_rejected_up_front(game, bank):
+    bank.with_suffix('.rules.json').write_text(json.dumps({'Hard': {'lengths': [5, 8], 'difficulty': [0.5, 1]}}))
+    with pytest.raises(ValueError, match='calibrate'):
+        game.FileBFS(str(bank)).session('Hard')
+
+
+@pytest.mark.parametrize('rule', [[5, 8], {'lengths': [5]}, {'lengths': [8, 5]}, {'rarity': ['a', 1]}, {'size': 3}])
+def test_malformed_rules_are_rejected(game, rule):
+    with pytest.raises(ValueError):
+        game.check_selection_rule(rule)
+
+
+def test_rarity_rule_draws_from_its_slice(game, bank):
+    bank.with_suffix('.rules.json').write_text(json.dumps({'Easy': {'lengths': [4, 6], 'rarity': [0, 1]}}))
+    for word, _ in game.FileBFS(str(bank)).session('Easy'):
+        assert 4 <= len(word) <= 6
+
+
+def test_rules_file_must_map_difficulties(game, bank):
+    bank.with_suffix('.rules.json').write_text(json.dumps([{'lengths': [4, 6]}]))
+    with pytest.raises(ValueError, match='expected an object'):
+        game.FileBFS(str(bank)).selection_rule('Easy')
+
+
+def test_rule_matching_too_few_words_is_refused_before_the_game(game, bank):
+    bank.with_suffix('.rules.json').write_text(json.dumps({'Easy': {'lengths': [20, 30]}}))
+    with pytest.raises(ValueError, match='only matches 0 words'):
+        game.FileBFS(str(bank)).plan_session('Easy', 10)
@@ -0,0 +1,12 @@
+def test_headless_startup_within_budget(game, word_file):
+    game.measure_startup(word_file, runs=1)  # compile the index outside the timed runs
+    result = game.measure_startup(word_file, runs=3)
+    assert result['median_ms'] <= game.STARTUP_BUDGET_MS, result
+
+
+def test_first_word_comes_from_the_bank(game, word_file):
+    import subprocess
+    import sys
+    proc = subprocess.run([sys.executable, game.__file__, '--word-file', word_file, 'play', '--first-word'],
+                          capture_output=True, text=True, check=True)
+    assert game.FileBFS(word_file).index.lookup(proc.stdout.strip()) >= 0
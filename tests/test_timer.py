@@ -0,0 +1,47 @@
+import time
+
+BUSY_MS = 150
+SLACK_MS = 60  # sleep and scheduling jitter on a loaded CI machine
+
+
+def test_countdown_does_not_drift_on_a_busy_loop(game):
+    result = game.check_timer_accuracy(time_limit=10, busy_ms=BUSY_MS, period_ms=230)
+    # A callback can only be held up by the one busy block running when it fell due
+    assert -SLACK_MS <= result['timeout_late_ms'] <= BUSY_MS + SLACK_MS, result
+    assert result['worst_redraw_late_ms'] <= BUSY_MS + SLACK_MS, result
+    # whereas counting after(1000) ticks adds every tick's lateness up over ten seconds
+    assert result['tick_counter_late_ms'] > result['timeout_late_ms'] + BUSY_MS, result
+
+
+def test_pause_moves_the_deadline_by_the_pause(game):
+    loop = game._BusyLoop()
+    engine = game.GameEngine('Easy', total_questions=1)
+    engine.time_limit = 1
+    expired = []
+    paused = []
+    timer = game.CountdownTimer(loop, lambda shown: None, lambda: expired.append(time.monotonic()))
+    engine.next_question()
+    engine.set_word('wizard', '')
+    start = engine.started_at
+
+    def busy():
+        time.sleep(BUSY_MS / 1000)
+        loop.after(80, busy)
+
+    def pause():
+        timer.pause()
+        paused.append(time.monotonic())
+
+    def resume():
+        paused.append(time.monotonic())
+        timer.resume()
+
+    timer.start(engine)
+    loop.after(0, busy)
+    loop.after(300, pause)
+    loop.after(800, resume)
+    loop.run(until=lambda: bool(expired))
+    # Measured against the pause that actually happened, however late its callbacks ran
+    pause_ms = (paused[1] - paused[0]) * 1000
+    late_ms = (expired[0] - start - engine.time_limit) * 1000 - pause_ms
+    assert -SLACK_MS <= late_ms <= BUSY_MS + SLACK_MS, (late_ms, pause_ms)
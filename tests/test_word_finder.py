@@ -0,0 +1,37 @@
+import random
+
+import pytest
+
+
+@pytest.fixture(scope='module')
+def finder(game, word_file):
+    return game.FileBFS(word_file).word_finder()
+
+
+def brute_force(game, index, guess, k):
+    words = (index.word(i) for i in index.row_ids())
+    return sorted((d, w) for w in words if (d := game._edit_distance(guess, w, k)) <= k)
+
+
+@pytest.mark.parametrize('max_distance', [0, 1, 2, 3])
+def test_nearest_is_exact_for_every_distance(game, finder, max_distance):
+    index = finder.index
+    rng = random.Random(max_distance)
+    words = [index.word(i) for i in index.row_ids()]
+    guesses = ['', 'a', 'ox', 'cat']
+    for word in rng.sample(words, 40):
+        chars = list(word)
+        for _ in range(rng.randint(0, 3)):
+            op = rng.randrange(3)
+            pos = rng.randrange(len(chars) + 1)
+            if op == 0:
+                chars.insert(pos, rng.choice('aeioust'))
+            elif chars and pos < len(chars):
+                if op == 1:
+                    del chars[pos]
+                else:
+                    chars[pos] = rng.choice('aeioust')
+        guesses.append(''.join(chars))
+    for guess in guesses:
+        expected = brute_force(game, index, guess, max_distance)
+        assert finder.nearest(guess, max_distance, limit=len(words)) == expected, guess
@@ -1,113 +1,3131 @@
+# Only what the first menu needs is imported here; PIL, asyncio, the executors
+# and the profiling modules are imported where they are first used.
+import argparse
 import tkinter as tk
 from tkinter import messagebox, ttk
 import random
 import threading
 import time
-from collections import deque
-from fuzzywuzzy import fuzz
 import csv
-from PIL import Image, ImageTk  # For image handling
 import os
+import json
 import re  # For regex pattern matching in hints
+import mmap
+import hashlib
+import sys
+import struct
+import math
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter, OrderedDict, deque
+from itertools import chain, islice
+from collections.abc import Mapping
+from functools import lru_cache, wraps
+from contextlib import contextmanager
+
+# --- Files & Directories ---
+@contextmanager
+def _atomic_write(path, mode='wb', fsync=False, **kwargs):
+    """Write to a temporary file next to path that replaces it only once the block succeeds"""
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    try:
+        with open(tmp_path, mode, **kwargs) as f:
+            yield f
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+# Per kind: override variable, then the Windows, macOS and XDG locations
+_USER_DIRS = {
+    'data': ('WORD_WIZARD_DATA', 'APPDATA', 'Roaming', 'Application Support', 'XDG_DATA_HOME', '.local/share'),
+    'cache': ('WORD_WIZARD_CACHE', 'LOCALAPPDATA', 'Local', 'Caches', 'XDG_CACHE_HOME', '.cache'),
+}
+
+
+def _user_dir(kind):
+    override, windows_var, windows_dir, mac_dir, xdg_var, xdg_dir = _USER_DIRS[kind]
+    if os.environ.get(override):
+        return os.environ[override]
+    if sys.platform == 'win32':
+        base = os.environ.get(windows_var) or os.path.expanduser(os.path.join('~', 'AppData', windows_dir))
+    elif sys.platform == 'darwin':
+        base = os.path.expanduser(os.path.join('~', 'Library', mac_dir))
+    else:
+        base = os.environ.get(xdg_var) or os.path.expanduser(os.path.join('~', xdg_dir))
+    return os.path.join(base, 'word-wizard')
+
+
+# --- Tracing ---
+class _Span:
+    __slots__ = ('tracer', 'name', 'fields', 'start')
+
+    def __init__(self, tracer, name, fields):
+        self.tracer = tracer
+        self.name = name
+        self.fields = fields
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer._finish(self, time.perf_counter() - self.start)
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """Timing spans and event counters, written as JSON lines to a local file
+
+    Disabled (the default), span() hands back a shared no-op context manager
+    and count() returns at once, so instrumented code pays one attribute check.
+    Enabled without a path, results are only kept in memory for the overlay.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.path = None
+        self.counters = {}
+        self.totals = {}  # span name -> [calls, total seconds]
+        self._file = None
+        self._lock = threading.Lock()
+
+    def enable(self, path=None):
+        if self.enabled:
+            return
+        if path:
+            import atexit
+            self._file = open(path, 'a', encoding='utf-8')
+            self.path = path
+            atexit.register(self.disable)
+        self.enabled = True
+
+    def disable(self):
+        if not self.enabled:
+            return
+        self.flush()
+        self.enabled = False
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def span(self, name, **fields):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, fields)
+
+    def count(self, name, n=1):
+        if self.enabled:
+            with self._lock:
+                self.counters[name] = self.counters.get(name, 0) + n
+
+    def flush(self):
+        """Write the counters so far as one record and push buffered lines to disk"""
+        with self._lock:
+            if self._file is not None:
+                self._file.write(json.dumps({'type': 'counters', 'ts': time.time(), **self.counters}) + '\n')
+                self._file.flush()
+
+    def _finish(self, span, seconds):
+        with self._lock:
+            totals = self.totals.setdefault(span.name, [0, 0.0])
+            totals[0] += 1
+            totals[1] += seconds
+            if self._file is not None:
+                record = {'type': 'span', 'name': span.name, 'ms': round(seconds * 1000, 4),
+                          'thread': threading.current_thread().name, 'ts': time.time()}
+                record.update(span.fields)
+                self._file.write(json.dumps(record) + '\n')
+
+
+TRACE = Tracer()
+
+
+def traced(name):
+    """Record every call of the decorated function as a span while tracing is enabled"""
+    def decorate(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not TRACE.enabled:
+                return fn(*args, **kwargs)
+            with TRACE.span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+# --- Compiled Word Index ---
+# Binary layout (native uint32 arrays, every section 4-byte aligned):
+#   header | name offsets | hint offsets | adjacency offsets | adjacency | names | hints
+# Words are interned to ids: ids below n_rows are CSV rows sorted by their
+# UTF-8 bytes, ids from n_rows up are names that only appear in neighbor lists.
+INDEX_MAGIC = b'WWIDX001'
+INDEX_HEADER = struct.Struct('<8sIIIIIqq')
+INDEX_BYTEORDER = 0x01020304
+
+
+def _parse_word_rows(lines):
+    """Normalize (word, hint, neighbors) rows from an iterable of CSV lines"""
+    reader = csv.DictReader(lines)
+    for row in reader:
+        word = row['word'].strip().lower()
+        hint = row['hint'].strip()
+        # A bank without neighbors yet (input for build-neighbors) reads as isolated words
+        neighbors = [w.strip().lower() for w in (row.get('neighbors') or '').split(';') if w.strip()]
+        yield word, hint, neighbors
+
+
+def _iter_word_csv(filepath):
+    """Stream (word, hint, neighbors) rows from the word bank CSV"""
+    with open(filepath, newline='', encoding='utf-8') as csvfile:
+        yield from _parse_word_rows(csvfile)
+
+
+def _pack_strings(strings):
+    """Concatenate strings into one UTF-8 blob plus an offsets array"""
+    offsets = array('I', [0])
+    blob = bytearray()
+    for text in strings:
+        blob += text.encode('utf-8')
+        offsets.append(len(blob))
+    return offsets, bytes(blob)
+
+
+def _random_order(n, rng=random):
+    """Yield 0..n-1 in random order using a sparse Fisher-Yates shuffle (memory grows with draws, not n)"""
+    swaps = {}
+    for i in range(n):
+        j = rng.randrange(i, n)
+        current = swaps.pop(i, i)
+        if j == i:
+            yield current
+        else:
+            yield swaps.get(j, j)
+            swaps[j] = current
+
+
+def compile_word_index(records, source_mtime_ns=0, source_size=0):
+    """Intern a stream of (word, hint, neighbors) rows into the compiled index format"""
+    # First pass: intern every name in order of first sight and keep row data
+    # in flat arrays; a repeated word keeps its last row, like the old dict did.
+    ids = {}
+    row_slots = array('i')  # provisional id -> row number, -1 for neighbor-only names
+    hints = bytearray()
+    hint_spans = array('I')
+    adjacency = array('I')
+    adj_spans = array('I')
+
+    def intern(name):
+        i = ids.get(name)
+        if i is None:
+            i = ids[name] = len(row_slots)
+            row_slots.append(-1)
+        return i
+
+    for word, hint, neighbors in records:
+        row_slots[intern(word)] = len(hint_spans) // 2
+        hint_spans.append(len(hints))
+        hints += hint.encode('utf-8')
+        hint_spans.append(len(hints))
+        adj_spans.append(len(adjacency))
+        adjacency.extend(intern(n) for n in neighbors)
+        adj_spans.append(len(adjacency))
+
+    # Second pass: renumber so rows come first in byte order, then external names
+    names = list(ids)
+    del ids
+    sort_key = lambda i: names[i].encode('utf-8')
+    order = sorted((i for i in range(len(names)) if row_slots[i] >= 0), key=sort_key)
+    n_rows = len(order)
+    order += sorted((i for i in range(len(names)) if row_slots[i] < 0), key=sort_key)
+    remap = array('I', bytes(4 * len(names)))
+    for new_id, old_id in enumerate(order):
+        remap[old_id] = new_id
+
+    hint_offsets = array('I', [0])
+    packed_hints = bytearray()
+    adj_offsets = array('I', [0])
+    packed_adjacency = array('I')
+    for old_id in order[:n_rows]:
+        slot = row_slots[old_id]
+        packed_hints += hints[hint_spans[2 * slot]:hint_spans[2 * slot + 1]]
+        hint_offsets.append(len(packed_hints))
+        packed_adjacency.extend(remap[n] for n in adjacency[adj_spans[2 * slot]:adj_spans[2 * slot + 1]])
+        adj_offsets.append(len(packed_adjacency))
+    name_offsets, packed_names = _pack_strings(names[i] for i in order)
+
+    header = INDEX_HEADER.pack(INDEX_MAGIC, INDEX_BYTEORDER, n_rows, len(names),
+                               len(packed_adjacency), 0, source_mtime_ns, source_size)
+    parts = [header, name_offsets.tobytes(), hint_offsets.tobytes(), adj_offsets.tobytes(),
+             packed_adjacency.tobytes(), packed_names, bytes(packed_hints)]
+    return b''.join(parts)
+
+
+class WordIndex:
+    """Read-only view over a compiled word index held in an mmap or bytes buffer"""
+
+    def __init__(self, buffer, source=None):
+        self._buffer = buffer
+        view = memoryview(buffer)
+        (magic, byteorder, self.n_rows, self.n_names, n_edges, _,
+         self.source_mtime_ns, self.source_size) = INDEX_HEADER.unpack_from(view)
+        if magic != INDEX_MAGIC or byteorder != INDEX_BYTEORDER:
+            raise ValueError("Unsupported word index format")
+        pos = INDEX_HEADER.size
+        sections = []
+        for count in (self.n_names + 1, self.n_rows + 1, self.n_rows + 1, n_edges):
+            sections.append(view[pos:pos + 4 * count].cast('I'))
+            pos += 4 * count
+        self._name_offsets, self._hint_offsets, self._adj_offsets, self._adjacency = sections
+        # Names are sliced straight from the buffer so lookups compare plain bytes
+        self._names_start = pos
+        pos += self._name_offsets[-1]
+        self._hints = view[pos:pos + self._hint_offsets[-1]]
+        self.source = source
+        self.row_limit = self.n_rows
+
+    @classmethod
+    def open(cls, filepath):
+        """Map a compiled index file into memory (pages are shared between processes)"""
+        with open(filepath, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(buffer, source=filepath)
+
+    @classmethod
+    def open_fresh(cls, csv_path, index_path=None):
+        """Open the compiled index for a CSV, or return None if it is missing or stale"""
+        stat = os.stat(csv_path)
+        try:
+            index = cls.open(index_path or csv_path + '.idx')
+        except (OSError, ValueError, struct.error):
+            return None
+        if (index.source_mtime_ns, index.source_size) == (stat.st_mtime_ns, stat.st_size):
+            return index
+        index.close()
+        return None
+
+    @classmethod
+    def build(cls, csv_path, index_path=None, records=None, stat=None):
+        """Compile records (parsed from csv_path by default) and save them as its index"""
+        index_path = index_path or csv_path + '.idx'
+        stat = stat or os.stat(csv_path)
+        if records is None:
+            records = _iter_word_csv(csv_path)
+        data = compile_word_index(records, stat.st_mtime_ns, stat.st_size)
+        try:
+            with _atomic_write(index_path) as f:
+                f.write(data)
+            return cls.open(index_path)
+        except OSError:
+            # Read-only location: keep the compiled buffer in memory instead
+            return cls(data)
+
+    @classmethod
+    def peek_rows(cls, csv_path, index_path=None):
+        """Row count from the header of a fresh compiled index, without mapping it; None if stale"""
+        try:
+            stat = os.stat(csv_path)
+            with open(index_path or csv_path + '.idx', 'rb') as f:
+                header = INDEX_HEADER.unpack(f.read(INDEX_HEADER.size))
+        except (OSError, struct.error):
+            return None
+        magic, byteorder, n_rows, _, _, _, mtime_ns, size = header
+        if magic != INDEX_MAGIC or byteorder != INDEX_BYTEORDER or (mtime_ns, size) != (stat.st_mtime_ns, stat.st_size):
+            return None
+        return n_rows
+
+    @classmethod
+    def load(cls, csv_path, index_path=None):
+        """Open the compiled index for a CSV, rebuilding it first if it is stale"""
+        return cls.open_fresh(csv_path, index_path) or cls.build(csv_path, index_path)
+
+    def close(self):
+        for name in ('_name_offsets', '_hint_offsets', '_adj_offsets', '_adjacency', '_hints'):
+            getattr(self, name).release()
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+
+    def __len__(self):
+        return self.n_rows
+
+    def row_ids(self):
+        return range(self.n_rows)
+
+    def iter_seeds(self, rng=random):
+        return _random_order(self.n_rows, rng)
+
+    def _name_bytes(self, i):
+        start = self._names_start
+        return self._buffer[start + self._name_offsets[i]:start + self._name_offsets[i + 1]]
+
+    def word(self, i):
+        return str(self._name_bytes(i), 'utf-8')
+
+    def hint(self, i):
+        return str(self._hints[self._hint_offsets[i]:self._hint_offsets[i + 1]], 'utf-8')
+
+    def neighbors(self, i):
+        return self._adjacency[self._adj_offsets[i]:self._adj_offsets[i + 1]]
+
+    def lookup(self, word):
+        """Binary search for a row id, returning -1 when the word is not a row"""
+        target = word.encode('utf-8')
+        lo, hi = 0, self.n_rows
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._name_bytes(mid) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.n_rows and self._name_bytes(lo) == target:
+            return lo
+        return -1
+
+
+class _StreamingIndex:
+    """Growing in-memory word store with the WordIndex read API, filled while the CSV streams in
+
+    Neighbors are kept as names and resolved on read, so only rows that have
+    already been loaded are ever returned as neighbor ids.
+    """
+
+    def __init__(self):
+        self._ids = {}
+        self._words = []
+        self._hints = []
+        self._neighbors = []
+        self.n_rows = 0
+        self.error = None  # why streaming stopped, if it failed
+
+    def add(self, word, hint, neighbors):
+        i = self._ids.get(word)
+        if i is not None:
+            # Later rows win, as in the compiled index
+            self._hints[i] = hint
+            self._neighbors[i] = neighbors
+            return
+        self._words.append(word)
+        self._hints.append(hint)
+        self._neighbors.append(neighbors)
+        # Publish the row last so readers never see it half-built
+        self._ids[word] = self.n_rows
+        self.n_rows += 1
+
+    def records(self):
+        return zip(self._words, self._hints, self._neighbors)
+
+    @property
+    def row_limit(self):
+        return self.n_rows
+
+    def __len__(self):
+        return self.n_rows
+
+    def row_ids(self):
+        return range(self.n_rows)
+
+    def iter_seeds(self, rng=random):
+        return _random_order(self.n_rows, rng)
+
+    def word(self, i):
+        return self._words[i]
+
+    def hint(self, i):
+        return self._hints[i]
+
+    def neighbors(self, i):
+        ids = self._ids
+        return [ids[n] for n in self._neighbors[i] if n in ids]
+
+    def lookup(self, word):
+        return self._ids.get(word, -1)
+
+
+class _PatchedIndex:
+    """WordIndex read API over a compiled base index plus rows changed since it was built
+
+    changes maps a word to its new (hint, neighbors) row, or to None when the
+    row was deleted. Words the base has no row for get ids past its names, and
+    neighbors are resolved to live rows up front, so BFS needs no row_limit.
+    """
+
+    row_limit = sys.maxsize
+
+    def __init__(self, base, changes):
+        self._base = base
+        self._rows = {}
+        self._ids = {}
+        self._added = []
+        self._removed = set()
+        for word, row in changes.items():
+            i = base.lookup(word)
+            if row is None:
+                if i >= 0:
+                    self._removed.add(i)
+                continue
+            if i < 0:
+                i = self._ids[word] = base.n_names + len(self._added)
+                self._added.append(word)
+            self._rows[i] = row
+        for i, (hint, names) in self._rows.items():
+            self._rows[i] = (hint, [n for n in map(self.lookup, names) if n >= 0])
+        self.n_rows = base.n_rows - len(self._removed) + len(self._added)
+
+    def __len__(self):
+        return self.n_rows
+
+    @property
+    def base(self):
+        return self._base
+
+    @property
+    def removed(self):
+        """Ids of the base's rows that the patch deletes"""
+        return self._removed
+
+    def added_ids(self):
+        """Ids of the rows the patch adds for words the base has no row for"""
+        return range(self._base.n_names, self._base.n_names + len(self._added))
+
+    def row_ids(self):
+        removed = self._removed
+        base = (i for i in range(self._base.n_rows) if i not in removed)
+        return chain(base, range(self._base.n_names, self._base.n_names + len(self._added)))
+
+    def iter_seeds(self, rng=random):
+        n_rows, n_names = self._base.n_rows, self._base.n_names
+        for pos in _random_order(n_rows + len(self._added), rng):
+            i = pos if pos < n_rows else n_names + pos - n_rows
+            if i not in self._removed:
+                yield i
+
+    def word(self, i):
+        n_names = self._base.n_names
+        return self._base.word(i) if i < n_names else self._added[i - n_names]
+
+    def hint(self, i):
+        row = self._rows.get(i)
+        return row[0] if row is not None else self._base.hint(i)
+
+    def neighbors(self, i):
+        row = self._rows.get(i)
+        if row is not None:
+            return row[1]
+        base = self._base
+        ids = []
+        for n in base.neighbors(i):
+            if n >= base.n_rows:
+                # A neighbor-only name of the base that may have gained a row since
+                n = self._ids.get(base.word(n), -1) if self._ids else -1
+            if n >= 0 and n not in self._removed:
+                ids.append(n)
+        return ids
+
+    def lookup(self, word):
+        i = self._ids.get(word)
+        if i is not None:
+            return i
+        i = self._base.lookup(word)
+        return -1 if i in self._removed else i
+
+
+def _decode_lines(data):
+    """CSV lines of UTF-8 file contents, split as reading the file would split them"""
+    return (line.decode('utf-8') for line in data.splitlines(True))
+
+
+def _common_run(a, b, limit, from_end=False, block=1 << 20):
+    """Length of the common prefix (or suffix) of two byte strings, at most limit
+
+    Whole blocks are compared first, then the differing block is narrowed
+    down by halving, so only O(log block) slices are compared in Python.
+    """
+    def same(lo, hi):
+        # Bytes lo..hi counted from the start, or from the end when from_end
+        if from_end:
+            return a[len(a) - hi:len(a) - lo] == b[len(b) - hi:len(b) - lo]
+        return a[lo:hi] == b[lo:hi]
+
+    n = 0
+    while n < limit and same(n, min(n + block, limit)):
+        n = min(n + block, limit)
+    hi = min(n + block, limit)
+    while hi > n:
+        mid = (n + hi + 1) // 2
+        if same(n, mid):
+            n = mid
+        else:
+            hi = mid - 1
+    return n
+
+
+def _changed_span(old, new):
+    """(start, old_end, new_end): the shortest run of whole lines where two file contents differ"""
+    limit = min(len(old), len(new))
+    start = _common_run(old, new, limit)
+    start = old.rfind(b'\n', 0, start) + 1
+    # Common tail, never reaching back into the common head
+    tail = _common_run(old, new, limit - start, from_end=True)
+    old_end, new_end = len(old) - tail, len(new) - tail
+    if old[old_end - 1:old_end] not in (b'\n', b'') or new[new_end - 1:new_end] not in (b'\n', b''):
+        # The tail starts mid-line on one side ("pple" -> "apple"); keep that whole line in the span
+        newline = old.find(b'\n', old_end)
+        tail = 0 if newline < 0 else len(old) - newline - 1
+    return start, len(old) - tail, len(new) - tail
+
+
+SHARD_ID_BITS = 24
+SHARD_ID_MASK = (1 << SHARD_ID_BITS) - 1
+
+
+class ShardedIndex:
+    """Word store spread over several word bank CSVs, each opened on first use
+
+    Global ids keep the shard number in their top 8 bits. Neighbor names that
+    a shard does not define are looked up in the other shards the first time
+    BFS reaches them. At most max_open shards stay mapped; the least recently
+    used one is dropped when another has to be opened.
+    """
+
+    def __init__(self, paths, max_open=8, rows=None):
+        self.paths = list(paths)
+        if not self.paths:
+            raise ValueError("Sharded word bank has no shards")
+        if len(self.paths) > 1 << (32 - SHARD_ID_BITS):
+            raise ValueError(f"Sharded word bank has more than {1 << (32 - SHARD_ID_BITS)} shards")
+        self.max_open = max_open
+        self.row_limit = 1 << 32  # neighbors() only ever returns row ids
+        self._open = OrderedDict()
+        self._owners = {}
+        self._lock = threading.Lock()
+        # Row counts per shard, from the manifest or learned when a shard is opened
+        self._rows = dict(enumerate(rows)) if rows else {}
+
+    @classmethod
+    def from_path(cls, path):
+        """Shards are every CSV in a directory, or those listed in a JSON manifest"""
+        if os.path.isdir(path):
+            return cls(sorted(os.path.join(path, name) for name in os.listdir(path)
+                              if name.endswith('.csv')))
+        with open(path, encoding='utf-8') as f:
+            manifest = json.load(f)
+        base = os.path.dirname(path)
+        return cls([os.path.join(base, shard) for shard in manifest['shards']],
+                   max_open=manifest.get('max_open', 8), rows=manifest.get('rows'))
+
+    def shard(self, k):
+        with self._lock:
+            index = self._open.get(k)
+            if index is not None:
+                self._open.move_to_end(k)
+                return index
+        index = WordIndex.load(self.paths[k])
+        with self._lock:
+            self._open[k] = index
+            self._rows[k] = index.n_rows
+            while len(self._open) > self.max_open:
+                # The mapping is released once no reader holds the evicted shard
+                self._open.popitem(last=False)
+        return index
+
+    def loaded_shards(self):
+        return list(self._open)
+
+    def _find(self, word, skip=-1):
+        """Global id of a row, searching open shards before opening the rest"""
+        gid = self._owners.get(word)
+        if gid is not None:
+            return gid
+        opened = self.loaded_shards()
+        for k in opened + [k for k in range(len(self.paths)) if k not in opened]:
+            if k == skip:
+                continue
+            local = self.shard(k).lookup(word)
+            if local >= 0:
+                gid = (k << SHARD_ID_BITS) | local
+                break
+        else:
+            gid = -1
+        self._owners[word] = gid
+        return gid
+
+    def shard_rows(self, k, compile=True):
+        """Rows in shard k, from the manifest or the compiled index header when possible
+
+        Only a shard without either is opened (and compiled) to count it, or
+        None is returned for it when compile is False.
+        """
+        rows = self._rows.get(k)
+        if rows is None:
+            rows = WordIndex.peek_rows(self.paths[k])
+            if rows is None and compile:
+                rows = self.shard(k).n_rows
+            if rows is not None:
+                self._rows[k] = rows
+        return rows
+
+    def __len__(self):
+        return sum(self.shard_rows(k) for k in range(len(self.paths)))
+
+    def row_ids(self):
+        """Every global row id; this opens every shard, so keep it off the startup path"""
+        for k in range(len(self.paths)):
+            for local in self.shard(k).row_ids():
+                yield (k << SHARD_ID_BITS) | local
+
+    def iter_seeds(self, rng=random):
+        """Seeds shard by shard in random order, so a session only opens the shards it reaches"""
+        for k in _random_order(len(self.paths), rng):
+            for local in self.shard(k).iter_seeds(rng):
+                yield (k << SHARD_ID_BITS) | local
+
+    def word(self, gid):
+        return self.shard(gid >> SHARD_ID_BITS).word(gid & SHARD_ID_MASK)
+
+    def hint(self, gid):
+        return self.shard(gid >> SHARD_ID_BITS).hint(gid & SHARD_ID_MASK)
+
+    def neighbors(self, gid):
+        k = gid >> SHARD_ID_BITS
+        index = self.shard(k)
+        base = k << SHARD_ID_BITS
+        result = []
+        for n in index.neighbors(gid & SHARD_ID_MASK):
+            if n < index.n_rows:
+                result.append(base | n)
+            else:
+                # Cross-shard edge: resolve the name in whichever shard defines it
+                target = self._find(index.word(n), skip=k)
+                if target >= 0:
+                    result.append(target)
+        return result
+
+    def lookup(self, word):
+        return self._find(word)
+
+
+class WordRecord:
+    """One word bank row viewed in place; record['hint'] works as it did for the old dicts"""
+    __slots__ = ('_index', 'id')
+
+    def __init__(self, index, i):
+        self._index = index
+        self.id = i
+
+    @property
+    def word(self):
+        return self._index.word(self.id)
+
+    @property
+    def hint(self):
+        return self._index.hint(self.id)
+
+    @property
+    def neighbors(self):
+        return [self._index.word(n) for n in self._index.neighbors(self.id)]
+
+    def __getitem__(self, key):
+        if key not in ('word', 'hint', 'neighbors'):
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __repr__(self):
+        return f"WordRecord({self.word!r})"
+
+
+class _GraphView(Mapping):
+    """Read-only {word: WordRecord} mapping on top of a WordIndex"""
+
+    def __init__(self, index):
+        self._index = index
+
+    def __getitem__(self, word):
+        i = self._index.lookup(word)
+        if i < 0:
+            raise KeyError(word)
+        return WordRecord(self._index, i)
+
+    def __contains__(self, word):
+        return isinstance(word, str) and self._index.lookup(word) >= 0
+
+    def __iter__(self):
+        return (self._index.word(i) for i in self._index.row_ids())
+
+    def __len__(self):
+        return len(self._index)
+
+
+def _synthetic_records(n_words, degree=3, seed=0):
+    """Yield a reproducible random word bank of n_words rows with degree neighbors each"""
+    rng = random.Random(seed)
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+
+    def name(i):
+        chars = []
+        i += 26 ** 3  # keep every name at least four letters long
+        while i:
+            i, r = divmod(i, 26)
+            chars.append(letters[r])
+        return ''.join(chars)
+
+    for i in range(n_words):
+        word = name(i)
+        hint = f"{word.capitalize()} is synthetic word number {i} in the bank."
+        yield word, hint, [name(rng.randrange(n_words)) for _ in range(degree)]
+
+
+def memory_report(sizes=(10_000, 100_000, 1_000_000), degree=3):
+    """Compare retained memory of the old dict-of-dicts graph with the compiled index"""
+    import tracemalloc
+    report = []
+    for n_words in sizes:
+        tracemalloc.start()
+        graph = {word: {'hint': hint, 'neighbors': neighbors}
+                 for word, hint, neighbors in _synthetic_records(n_words, degree)}
+        dict_bytes = tracemalloc.get_traced_memory()[0]
+        del graph
+        tracemalloc.stop()
+
+        tracemalloc.start()
+        index = WordIndex(compile_word_index(_synthetic_records(n_words, degree)))
+        index_bytes, build_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        index.close()
+        report.append({'words': n_words, 'dict_bytes': dict_bytes,
+                       'index_bytes': index_bytes, 'index_build_peak_bytes': build_peak})
+    return report
+
+
+# --- Depth-Ring Cache ---
+RINGS_MAGIC = b'WWRNG001'
+RINGS_HEADER = struct.Struct('<8sIIIIIqq')
+
+
+def _farthest_ring(index, seed, max_depth, min_len, max_len):
+    """BFS from seed and return the ids of playable words in the farthest ring reached"""
+    visited = {seed}
+    frontier = [seed]
+    row_limit = index.row_limit
+    ring = array('I')
+    for depth in range(max_depth + 1):
+        playable = array('I')
+        next_frontier = []
+        for node in frontier:
+            word = index.word(node)
+            if min_len <= len(word) <= max_len and word.isalpha():
+                playable.append(node)
+            if depth < max_depth:
+                for nbr in index.neighbors(node):
+                    # Names past row_limit have no row of their own, so BFS stops there
+                    if nbr < row_limit and nbr not in visited:
+                        visited.add(nbr)
+                        next_frontier.append(nbr)
+        if playable:
+            ring = playable
+        if not next_frontier:
+            break
+        frontier = next_frontier
+    TRACE.count('bfs_nodes_visited', len(visited))
+    return ring
+
+
+class RingCache:
+    """LRU of farthest-ring candidates keyed by (seed, depth, min_len, max_len)
+
+    Rings persisted with save() are memory-mapped and answer lookups for their
+    length filter without touching the LRU.
+    """
+
+    def __init__(self, index, maxsize=65536):
+        self.index = index
+        self.maxsize = maxsize
+        self._lru = OrderedDict()
+        self._persisted = {}
+        self._persisted_filter = None
+        self._buffer = None
+
+    def get(self, seed, depth, min_len=4, max_len=10):
+        if (min_len, max_len) == self._persisted_filter and depth in self._persisted:
+            offsets, ids = self._persisted[depth]
+            return ids[offsets[seed]:offsets[seed + 1]]
+        key = (seed, depth, min_len, max_len)
+        ring = self._lru.get(key)
+        if ring is not None:
+            self._lru.move_to_end(key)
+            return ring
+        TRACE.count('ring_cache_misses')
+        ring = _farthest_ring(self.index, seed, depth, min_len, max_len)
+        self._lru[key] = ring
+        if len(self._lru) > self.maxsize:
+            self._lru.popitem(last=False)
+        return ring
+
+    def save(self, path, depths=(1, 2, 3), min_len=4, max_len=10):
+        """Precompute every seed's ring for the given depths and write them to path"""
+        index = self.index
+        header = RINGS_HEADER.pack(RINGS_MAGIC, INDEX_BYTEORDER, index.n_rows, len(depths),
+                                   min_len, max_len, index.source_mtime_ns, index.source_size)
+        with _atomic_write(path) as f:
+            f.write(header)
+            f.write(array('I', depths).tobytes())
+            for depth in depths:
+                offsets = array('I', [0])
+                ids = array('I')
+                for seed in range(index.n_rows):
+                    ids.extend(_farthest_ring(index, seed, depth, min_len, max_len))
+                    offsets.append(len(ids))
+                f.write(struct.pack('<I', len(ids)))
+                f.write(offsets.tobytes())
+                f.write(ids.tobytes())
+
+    def attach(self, path):
+        """Map rings written by save(), ignoring files built from another word bank"""
+        index = self.index
+        with open(path, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(buffer)
+        (magic, byteorder, n_rows, n_depths, min_len, max_len,
+         mtime_ns, size) = RINGS_HEADER.unpack_from(view)
+        if (magic, byteorder, n_rows, mtime_ns, size) != (
+                RINGS_MAGIC, INDEX_BYTEORDER, index.n_rows, index.source_mtime_ns, index.source_size):
+            view.release()
+            buffer.close()
+            return False
+        pos = RINGS_HEADER.size
+        depths = view[pos:pos + 4 * n_depths].cast('I').tolist()
+        pos += 4 * n_depths
+        for depth in depths:
+            (count,) = struct.unpack_from('<I', view, pos)
+            pos += 4
+            offsets = view[pos:pos + 4 * (n_rows + 1)].cast('I')
+            pos += 4 * (n_rows + 1)
+            self._persisted[depth] = (offsets, view[pos:pos + 4 * count].cast('I'))
+            pos += 4 * count
+        self._persisted_filter = (min_len, max_len)
+        self._buffer = buffer
+        return True
+
+
+# --- Word Bank Compiler ---
+def normalize_word_bank(records, symmetric=False, sample_seeds=10_000, min_len=4, max_len=10, seed=0):
+    """Validate and clean a word bank's neighbor graph in time linear in its size
+
+    Drops neighbors that are not rows (dangling edges), self-loops and
+    repeated neighbors, keeps the last of repeated rows like the index does,
+    and optionally adds the reverse of every edge. Returns a function yielding
+    the cleaned (word, hint, neighbors) rows, and a report with connected
+    components and which seeds (up to sample_seeds of them) have their
+    farthest playable ring at each difficulty's BFS depth, which stop short
+    of it, and which reach no playable word at all.
+    """
+    ids = {}
+    words, hints, raw = [], [], []
+    duplicate_rows = 0
+    for word, hint, neighbors in records:
+        i = ids.get(word)
+        if i is None:
+            ids[word] = len(words)
+            words.append(word)
+            hints.append(hint)
+            raw.append(neighbors)
+        else:
+            duplicate_rows += 1
+            hints[i] = hint
+            raw[i] = neighbors
+    n = len(words)
+
+    # Forward edges as CSR arrays: row i's neighbors are edges[offsets[i]:offsets[i + 1]]
+    dangling = Counter()
+    self_loops = duplicate_edges = 0
+    offsets = array('I', [0])
+    edges = array('I')
+    for i, neighbors in enumerate(raw):
+        seen = set()
+        for name in neighbors:
+            j = ids.get(name)
+            if j is None:
+                dangling[name] += 1
+            elif j == i:
+                self_loops += 1
+            elif j in seen:
+                duplicate_edges += 1
+            else:
+                seen.add(j)
+                edges.append(j)
+        offsets.append(len(edges))
+    del raw, ids
+
+    added = 0
+    if symmetric:
+        # Counting sort the edges by target to get every row's incoming sources
+        in_offsets = array('I', bytes(4 * (n + 1)))
+        for j in edges:
+            in_offsets[j + 1] += 1
+        for i in range(n):
+            in_offsets[i + 1] += in_offsets[i]
+        fill = array('I', in_offsets)
+        sources = array('I', bytes(4 * len(edges)))
+        for i in range(n):
+            for j in edges[offsets[i]:offsets[i + 1]]:
+                sources[fill[j]] = i
+                fill[j] += 1
+        merged_offsets = array('I', [0])
+        merged = array('I')
+        for i in range(n):
+            out = edges[offsets[i]:offsets[i + 1]]
+            merged.extend(out)
+            present = set(out)
+            for src in sources[in_offsets[i]:in_offsets[i + 1]]:
+                if src not in present:
+                    present.add(src)
+                    merged.append(src)
+                    added += 1
+            merged_offsets.append(len(merged))
+        offsets, edges = merged_offsets, merged
+        del in_offsets, fill, sources
+
+    # Connected components (edges taken as undirected) with union-find
+    parent = array('i', range(n))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for i in range(n):
+        for j in edges[offsets[i]:offsets[i + 1]]:
+            a, b = find(i), find(j)
+            if a != b:
+                parent[a] = b
+    sizes = Counter(find(i) for i in range(n))
+
+    def playable(i):
+        return min_len <= len(words[i]) <= max_len and words[i].isalpha()
+
+    def ring_depth(start, max_depth):
+        # Depth of the farthest ring with a playable word, as _farthest_ring picks it
+        visited = {start}
+        frontier = [start]
+        found = 0 if playable(start) else None
+        for depth in range(1, max_depth + 1):
+            frontier = [j for i in frontier for j in edges[offsets[i]:offsets[i + 1]]
+                        if j not in visited and not visited.add(j)]
+            if not frontier:
+                break
+            if any(playable(j) for j in frontier):
+                found = depth
+        return found
+
+    rng = random.Random(seed)
+    sampled = range(n) if n <= sample_seeds else rng.sample(range(n), sample_seeds)
+    coverage = {}
+    for difficulty, settings in DIFFICULTY_SETTINGS.items():
+        depth = settings['max_depth']
+        by_depth = {}
+        for i in sampled:
+            by_depth.setdefault(ring_depth(i, depth), []).append(words[i])
+        coverage[difficulty] = {
+            'depth': depth,
+            'sampled_seeds': len(sampled),
+            'full_depth_seeds': len(by_depth.get(depth, ())),
+            'no_candidate_seeds': len(by_depth.get(None, ())),
+            'full_depth_words': sorted(by_depth.get(depth, ())),
+            'shallower_words': sorted(w for d, ws in by_depth.items() if d not in (depth, None) for w in ws),
+            'no_candidate_words': sorted(by_depth.get(None, ())),
+        }
+
+    report = {
+        'rows': n,
+        'duplicate_rows': duplicate_rows,
+        'edges': len(edges),
+        'dangling_edges': sum(dangling.values()),
+        'top_dangling': dangling.most_common(10),
+        'self_loops': self_loops,
+        'duplicate_edges': duplicate_edges,
+        'reverse_edges_added': added,
+        'components': len(sizes),
+        'largest_component': max(sizes.values(), default=0),
+        'isolated_words': sum(1 for size in sizes.values() if size == 1),
+        'coverage': coverage,
+    }
+
+    def rows():
+        for i in range(n):
+            yield words[i], hints[i], [words[j] for j in edges[offsets[i]:offsets[i + 1]]]
+    return rows, report
+
+
+def _similarity_features(word, hint):
+    """Weighted features of one row: hint words (minus the word itself) and the word's 3-grams"""
+    features = Counter(t for t in re.findall(r"[a-z]+", hint.lower()) if len(t) > 2 and t != word)
+    padded = f'^{word}$'
+    for i in range(len(padded) - 2):
+        features['#' + padded[i:i + 3]] += 0.5
+    return features
+
+
+def build_neighbors(rows, k=3, dims=256, memory_mb=64, min_similarity=0.05):
+    """Derive each row's neighbors from hint and spelling similarity with NumPy
+
+    Features are TF-IDF weighted hint words plus character 3-grams of the
+    word, hashed with random signs into dims columns and L2-normalized. Rows
+    are then compared chunk by chunk against the whole bank, with chunks sized
+    so one block of similarities and the indices argpartition returns for it
+    stay under memory_mb together, and each row keeps its k most similar rows
+    above min_similarity. Needs NumPy.
+    """
+    import zlib
+    import numpy as np
+
+    rows = list(rows)
+    n = len(rows)
+    counted = [_similarity_features(word, hint) for word, hint, _ in rows]
+    df = Counter(f for features in counted for f in features)
+    # Each distinct feature hashes once to its column, sign and IDF weight
+    columns = {}
+    for f, count in df.items():
+        h = zlib.crc32(f.encode('utf-8'))
+        columns[f] = (h % dims, 1.0 if h & 0x80000000 else -1.0, np.log((1 + n) / (1 + count)) + 1.0)
+
+    vectors = np.zeros((n, dims), dtype=np.float32)
+    for i, features in enumerate(counted):
+        row = vectors[i]
+        for f, tf in features.items():
+            col, sign, idf = columns[f]
+            row[col] += sign * tf * idf
+    del counted, columns
+    norms = np.linalg.norm(vectors, axis=1)
+    norms[norms == 0] = 1.0
+    vectors /= norms[:, None]
+
+    k = min(k, n - 1)
+    # Per row of a block: a float32 score per row of the bank plus argpartition's intp index for each
+    row_bytes = max(n, 1) * (np.dtype(np.float32).itemsize + np.dtype(np.intp).itemsize)
+    chunk = max(1, min(n, memory_mb * 2**20 // row_bytes))
+    for start in range(0, n, chunk):
+        block = vectors[start:start + chunk] @ vectors.T
+        block[np.arange(block.shape[0]), np.arange(start, start + block.shape[0])] = -np.inf
+        if k <= 0:
+            top = np.empty((block.shape[0], 0), dtype=np.intp)
+        else:
+            top = np.argpartition(block, -k, axis=1)[:, -k:]
+        scores = np.take_along_axis(block, top, axis=1)
+        order = np.argsort(-scores, axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        scores = np.take_along_axis(scores, order, axis=1)
+        for offset in range(block.shape[0]):
+            word, hint, _ = rows[start + offset]
+            neighbors = [rows[j][0] for j, score in zip(top[offset], scores[offset]) if score >= min_similarity]
+            yield word, hint, neighbors
+        del block, top  # before the next block is allocated, so only one is alive at a time
+
+
+def write_word_bank(path, rows):
+    """Write (word, hint, neighbors) rows as a word bank CSV, replacing path atomically"""
+    with _atomic_write(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['word', 'hint', 'neighbors'])
+        for word, hint, neighbors in rows:
+            writer.writerow([word, hint, ';'.join(neighbors)])
+
+
+# --- Hint Masking ---
+HINT_REPLACEMENTS = ("this word", "it", "this term", "the answer")
+
+
+@lru_cache(maxsize=8192)
+def _hint_segments(word, hint):
+    """Split a hint around every mention of word, keeping the hint's own casing
+
+    Mentions match case-insensitively and include plural, possessive and
+    simple verb forms, so callers only join the segments with a replacement.
+    """
+    lower = hint.lower()
+    stem = word[:-1] if word.endswith('y') else word
+    if not stem or stem not in lower:
+        return (hint,)
+    if len(lower) != len(hint):
+        # Lowercasing changed offsets; fall back to a case-insensitive regex.
+        forms = [re.escape(word) + r"(?:'s|s|es|ed|ing)?"]
+        if stem != word:
+            forms.append(re.escape(stem) + 'ies')
+        pattern = re.compile(r'\b(?:' + '|'.join(forms) + r')\b', re.IGNORECASE)
+        return tuple(pattern.split(hint))
+
+    # A plain scan instead of a compiled pattern per word: batch jobs touch
+    # far more words than the cache holds, and re.compile dominated them.
+    def boundary(pos):
+        return pos == len(lower) or not (lower[pos].isalnum() or lower[pos] == '_')
+
+    segments = []
+    last = 0
+    pos = lower.find(stem)
+    while pos != -1:
+        end = None
+        if pos == 0 or not (lower[pos - 1].isalnum() or lower[pos - 1] == '_'):
+            if lower.startswith(word, pos):
+                after = pos + len(word)
+                for suffix in ("'s", 's', 'es', 'ed', 'ing', ''):
+                    if lower.startswith(suffix, after) and boundary(after + len(suffix)):
+                        end = after + len(suffix)
+                        break
+            if end is None and stem != word and lower.startswith('ies', pos + len(stem)) \
+                    and boundary(pos + len(stem) + 3):
+                end = pos + len(stem) + 3
+        if end is None:
+            pos = lower.find(stem, pos + 1)
+            continue
+        segments.append(hint[last:pos])
+        last = end
+        pos = lower.find(stem, end)
+    segments.append(hint[last:])
+    return tuple(segments)
+
+
+# --- Difficulty Buckets ---
+class WordBuckets:
+    """Playable words sorted by (length, score), so any slice is a few bisects away
+
+    Two orders are kept: 'rarity', the percentile of a word's mean letter
+    surprisal in this bank (0 = common letters), and 'difficulty', the
+    calibrated score for words that have one. A selection rule such as
+    {'lengths': [5, 8], 'difficulty': [0.2, 0.6]} maps to one contiguous id
+    range per length, and words are drawn uniformly across those ranges.
+
+    Given base, the buckets of the index a _PatchedIndex patches, only the
+    rows the patch adds are scored and sorted, against the base's letter
+    statistics; the base's ranges are reused and its removed rows skipped.
+    """
+
+    def __init__(self, index, difficulty=None, base=None):
+        self.index = index
+        self._difficulty = difficulty or {}
+        if base is not None:
+            self._surprisal, self._ranked = base._surprisal, base._ranked
+            self._removed = index.removed
+            words = {i: w for i, w in ((i, index.word(i)) for i in index.added_ids()) if w.isalpha()}
+            rarity = {i: self._rarity(w) for i, w in words.items()}
+        else:
+            self._removed = frozenset()
+            words = {}
+            letters = Counter()
+            for i in index.row_ids():
+                word = index.word(i)
+                if word.isalpha():
+                    words[i] = word
+                    letters.update(word)
+            total = sum(letters.values()) or 1
+            self._surprisal = {ch: -math.log2(count / total) for ch, count in letters.items()}
+            mean = {i: self._mean_surprisal(w) for i, w in words.items()}
+            self._ranked = array('d', sorted(mean.values()))
+            rarity = {i: self._percentile(m) for i, m in mean.items()}
+        self._orders = {'rarity': [self._sorted(words, rarity)]}
+        if difficulty:
+            scores = {i: difficulty[w] for i, w in words.items() if w in difficulty}
+            self._orders['difficulty'] = [self._sorted(words, scores)]
+        if base is not None:
+            for key in self._orders:
+                self._orders[key] = base._orders.get(key, []) + self._orders[key]
+
+    def _mean_surprisal(self, word):
+        # A letter the base never had is as surprising as a letter seen once
+        unseen = max(self._surprisal.values(), default=0.0)
+        return sum(self._surprisal.get(ch, unseen) for ch in word) / len(word)
+
+    def _percentile(self, mean):
+        return min(1.0, bisect_left(self._ranked, mean) / max(1, len(self._ranked) - 1))
+
+    def _rarity(self, word):
+        """Percentile of a word's letter surprisal among the words the statistics came from"""
+        return self._percentile(self._mean_surprisal(word))
+
+    def _score(self, key, word):
+        return self._rarity(word) if key == 'rarity' else self._difficulty.get(word)
+
+    @staticmethod
+    def _sorted(words, scores):
+        """(ids, scores, {length: (start, end)}) with ids ordered by (length, score)"""
+        order = sorted(scores, key=lambda i: (len(words[i]), scores[i]))
+        ids = array('i', order)
+        values = array('d', (scores[i] for i in order))
+        spans = {}
+        for pos, i in enumerate(order):
+            start, _ = spans.get(len(words[i]), (pos, pos))
+            spans[len(words[i])] = (start, pos + 1)
+        return ids, values, spans
+
+    def ranges(self, rule):
+        """Contiguous (ids, start, end) slices matching a selection rule"""
+        min_len, max_len = rule.get('lengths', (4, 10))
+        key = 'difficulty' if 'difficulty' in rule else 'rarity'
+        if key not in self._orders:
+            raise ValueError("Selection rule needs calibrated difficulty; run the calibrate command first")
+        low, high = rule.get(key, (0.0, 1.0))
+        slices = []
+        for ids, values, spans in self._orders[key]:
+            for length in range(min_len, max_len + 1):
+                if length in spans:
+                    start, end = spans[length]
+                    lo = bisect_left(values, low, start, end)
+                    hi = bisect_right(values, high, lo, end)
+                    if lo < hi:
+                        slices.append((ids, lo, hi))
+        return slices
+
+    def count(self, rule):
+        total = sum(hi - lo for _, lo, hi in self.ranges(rule))
+        if self._removed:
+            # Removed rows are still in the base's ranges; take off those the rule matches
+            min_len, max_len = rule.get('lengths', (4, 10))
+            key = 'difficulty' if 'difficulty' in rule else 'rarity'
+            low, high = rule.get(key, (0.0, 1.0))
+            base = self.index.base
+            for i in self._removed:
+                word = base.word(i)
+                score = self._score(key, word) if word.isalpha() else None
+                if score is not None and min_len <= len(word) <= max_len and low <= score <= high:
+                    total -= 1
+        return total
+
+    def sample(self, rule, exclude=(), rng=random):
+        """Yield distinct word ids from the rule's slice in uniformly random order
+
+        A lazy Fisher-Yates shuffle over the concatenated ranges: every draw
+        is one bisect over the range offsets and never retries.
+        """
+        slices = self.ranges(rule)
+        offsets = []
+        total = 0
+        for _, lo, hi in slices:
+            offsets.append(total)
+            total += hi - lo
+        swapped = {}
+        skip = {i for i in map(self.index.lookup, exclude) if i >= 0} | self._removed
+        for remaining in range(total, 0, -1):
+            pick = rng.randrange(remaining)
+            pos = swapped.get(pick, pick)
+            swapped[pick] = swapped.get(remaining - 1, remaining - 1)
+            k = bisect_right(offsets, pos) - 1
+            ids, lo, _ = slices[k]
+            i = ids[lo + pos - offsets[k]]
+            if i not in skip:
+                yield i
+
+
+def synonyms_path(filepath):
+    """Where extra accepted answers for a word bank are listed"""
+    return os.path.splitext(filepath.rstrip(os.sep))[0] + '.synonyms.csv'
+
+
+def selection_rules_path(filepath):
+    """Where per-difficulty selection rules for a word bank are configured"""
+    return os.path.splitext(filepath.rstrip(os.sep))[0] + '.rules.json'
+
+
+def check_selection_rule(rule):
+    """Raise ValueError unless rule is a well-formed WordBuckets selection rule"""
+    if not isinstance(rule, dict):
+        raise ValueError(f"Selection rule must be a JSON object, not {rule!r}")
+    unknown = set(rule) - {'lengths', 'difficulty', 'rarity'}
+    if unknown:
+        raise ValueError(f"Unknown selection rule keys: {', '.join(sorted(unknown))}")
+    for key, kinds in (('lengths', int), ('difficulty', (int, float)), ('rarity', (int, float))):
+        value = rule.get(key, [0, 0])
+        if not (isinstance(value, (list, tuple)) and len(value) == 2
+                and all(isinstance(v, kinds) and not isinstance(v, bool) for v in value) and value[0] <= value[1]):
+            raise ValueError(f"Selection rule {key!r} must be a [low, high] pair, got {value!r}")
+
 
 # --- BFS File-Based Word Picker ---
 class FileBFS:
-    def __init__(self, filepath='words.csv'):
-        self.graph = {}
-        with open(filepath, newline='', encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                word = row['word'].strip().lower()
-                hint = row['hint'].strip()
-                neighbors = [w.strip().lower() for w in row['neighbors'].split(';') if w.strip()]
-                self.graph[word] = {'hint': hint, 'neighbors': neighbors}
+    # Rows that must be streamed in before a game at each BFS depth can start
+    STREAM_READY_ROWS = {1: 200, 2: 1000, 3: 5000}
+
+    @traced('FileBFS.load')
+    def __init__(self, filepath='words.csv', ring_cache_size=65536, background=False):
+        self.filepath = filepath
+        self.ring_cache_size = ring_cache_size
+        self.loaded = threading.Event()
+        self._difficulty = None
+        self._rules = None
+        self._synonyms = None
+        self._buckets = None
+        self._buckets_lock = threading.Lock()
+        self._base_buckets = None  # over self._base, reused by the buckets of each patch over it
+        self._finder = None
+        self._base_finder = None
+        self._finder_lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._base = None  # compiled index that reload() patches
+        self._changes = {}
+        self._source = None  # CSV bytes the current snapshot was built from
+        self._source_stat = None
+        self._watch_stop = None
+        self._bytes_loaded = 0
+        self._bytes_total = 0
+        if os.path.isdir(filepath) or filepath.endswith('.json'):
+            # Sharded word bank: shards open lazily as sessions and BFS reach them
+            self._use_index(ShardedIndex.from_path(filepath))
+            return
+        index = WordIndex.open_fresh(filepath)
+        if index is None and background:
+            # Serve the menu right away and stream the CSV in on a worker thread
+            self._use_index(_StreamingIndex())
+            threading.Thread(target=self._stream_load, daemon=True, name='word-bank-loader').start()
+        else:
+            self._use_index(index or WordIndex.build(filepath))
+
+    def _use_index(self, index):
+        rings = RingCache(index, maxsize=self.ring_cache_size)
+        if isinstance(index, WordIndex):
+            try:
+                rings.attach(self.filepath + '.rings')
+            except (OSError, ValueError, struct.error):
+                pass
+        if not isinstance(index, _StreamingIndex):
+            self.loaded.set()
+        # Readers take self.rings once and use rings.index, so this swap is safe mid-game
+        self.rings = rings
+        self.index = index
+        self.graph = _GraphView(index)
+
+    @traced('FileBFS.stream_load')
+    def _stream_load(self, chunk_rows=2000):
+        stat = os.stat(self.filepath)
+        self._bytes_total = stat.st_size
+        partial = self.index
+
+        def lines(raw):
+            for line in raw:
+                self._bytes_loaded += len(line)
+                yield line.decode('utf-8')
+
+        try:
+            with open(self.filepath, 'rb') as raw:
+                rows = _parse_word_rows(lines(raw))
+                while True:
+                    chunk = list(islice(rows, chunk_rows))
+                    for record in chunk:
+                        partial.add(*record)
+                    if len(chunk) < chunk_rows:
+                        break
+                    time.sleep(0)  # let the UI thread take the GIL between chunks
+            self._use_index(WordIndex.build(self.filepath, records=partial.records(), stat=stat))
+        except Exception as e:
+            TRACE.count('word_bank_load_errors')
+            partial.error = str(e) or type(e).__name__
+        finally:
+            self.loaded.set()  # a failed load is finished too; load_error says why
+
+    def word_count(self):
+        """Rows in the bank, or None when counting would mean compiling shards nobody opened yet"""
+        index = self.rings.index
+        if isinstance(index, ShardedIndex):
+            counts = [index.shard_rows(k, compile=False) for k in range(len(index.paths))]
+            return None if None in counts else sum(counts)
+        return len(index)
+
+    def progress(self):
+        """Fraction of the word bank loaded so far"""
+        if self.loaded.is_set():
+            return 1.0
+        return self._bytes_loaded / self._bytes_total if self._bytes_total else 0.0
+
+    @property
+    def load_error(self):
+        """Why streaming the word bank in failed, or None"""
+        return getattr(self.rings.index, 'error', None)
+
+    def ready_for(self, max_depth):
+        """True once enough of the bank is loaded to play at this BFS depth"""
+        return self.loaded.is_set() or self.index.n_rows >= self.STREAM_READY_ROWS.get(max_depth, 0)
+
+    def precompute_rings(self, depths=(1, 2, 3), min_len=4, max_len=10):
+        """Persist farthest-ring candidates for every seed next to the word bank"""
+        if not isinstance(self.index, WordIndex):
+            raise ValueError("Ring files can only be built for a single-CSV word bank")
+        path = self.filepath + '.rings'
+        self.rings.save(path, depths, min_len, max_len)
+        self.rings.attach(path)
+
+    @traced('FileBFS.reload')
+    def reload(self, rebuild_ratio=0.1):
+        """Apply edits of the CSV to the word bank and publish them as a new snapshot
+
+        Only the run of lines between the unchanged head and tail of the file
+        is parsed, and the rows in it become a patch over the compiled index.
+        A changed header or a patch over rebuild_ratio of the rows compiles the
+        whole bank instead. Returns counts of added, changed and removed rows.
+        """
+        with self._reload_lock:
+            stat = os.stat(self.filepath)
+            with open(self.filepath, 'rb') as f:
+                data = f.read()
+            old = self._source
+            header_end = data.find(b'\n') + 1
+            start, old_end, new_end = _changed_span(old, data) if old is not None else (0, 0, len(data))
+            current = self.rings.index
+            if old is None or start < header_end or old[:header_end] != data[:header_end]:
+                index = WordIndex.build(self.filepath, records=_parse_word_rows(_decode_lines(data)), stat=stat)
+                summary = {'full': True, 'rows': len(index)}
+                self._base, self._changes = index, {}
+            else:
+                def rows(chunk):
+                    lines = _decode_lines(data[:header_end] + chunk)
+                    return {word: (hint, neighbors) for word, hint, neighbors in _parse_word_rows(lines)}
+
+                # Assumes each word has one row; run compile-bank on banks with repeats
+                before, after = rows(old[start:old_end]), rows(data[start:new_end])
+                changes = dict(self._changes)
+                changes.update((word, None) for word in before.keys() - after.keys())
+                changes.update((word, row) for word, row in after.items() if before.get(word) != row)
+                summary = {
+                    'full': False,
+                    'added': sum(1 for word in after if current.lookup(word) < 0),
+                    'changed': sum(1 for word in after if word in before and before[word] != after[word]),
+                    'removed': len(before.keys() - after.keys()),
+                }
+                if len(changes) > rebuild_ratio * len(self._base):
+                    index = WordIndex.build(self.filepath, records=_parse_word_rows(_decode_lines(data)), stat=stat)
+                    self._base, self._changes = index, {}
+                    summary.update(full=True, rows=len(index))
+                else:
+                    index = _PatchedIndex(self._base, changes)
+                    self._changes = changes
+            self._source = data
+            self._source_stat = (stat.st_mtime_ns, stat.st_size)
+            self._use_index(index)
+            TRACE.count('word_bank_reloads')
+            return summary
+
+    def watch(self, interval=1.0, on_reload=None):
+        """Reload the bank on a daemon thread whenever its CSV changes; on_reload gets each summary
+
+        Returns False for sharded banks, which are not watched.
+        """
+        if os.path.isdir(self.filepath) or self.filepath.endswith('.json'):
+            return False
+        self.unwatch()
+        stop = self._watch_stop = threading.Event()
+        threading.Thread(target=self._watch_loop, args=(stop, interval, on_reload),
+                         daemon=True, name='word-bank-watcher').start()
+        return True
+
+    def unwatch(self):
+        if self._watch_stop is not None:
+            self._watch_stop.set()
+            self._watch_stop = None
+
+    def _watch_loop(self, stop, interval, on_reload):
+        self.loaded.wait()
+        with self._reload_lock:
+            index = self.rings.index
+            if self._source is None and isinstance(index, WordIndex):
+                before = os.stat(self.filepath)
+                with open(self.filepath, 'rb') as f:
+                    data = f.read()
+                after = os.stat(self.filepath)
+                compiled = (index.source_mtime_ns, index.source_size)
+                # Otherwise the CSV changed since it was compiled and the first check rebuilds it
+                if (before.st_mtime_ns, before.st_size) == (after.st_mtime_ns, after.st_size) == compiled:
+                    self._source, self._source_stat = data, compiled
+                    self._base, self._changes = index, {}
+        seen = None
+        while not stop.wait(interval):
+            try:
+                stat = os.stat(self.filepath)
+            except OSError:
+                continue  # mid-replace by an editor; look again next time
+            current = (stat.st_mtime_ns, stat.st_size)
+            if current == self._source_stat and self._source is not None:
+                continue
+            if current != seen:
+                seen = current  # wait one more interval in case it is still being written
+                continue
+            try:
+                summary = self.reload()
+            except (OSError, UnicodeDecodeError, csv.Error, KeyError, AttributeError) as e:
+                # AttributeError: a row with missing columns
+                summary = {'error': str(e)}
+                self._source_stat = current  # don't retry until the file changes again
+            if 'error' not in summary and self._finder is not None:
+                self.word_finder()  # patch near-miss lookups here rather than on the UI thread
+            if on_reload is not None:
+                on_reload(summary)
+
+    @traced('FileBFS.get_word')
+    def get_word(self, start, max_depth=1, min_len=4, max_len=10):
+        rings = self.rings
+        seed = rings.index.lookup(start.lower())
+        if seed < 0:
+            return None
+        top = rings.get(seed, max_depth, min_len, max_len)
+        return rings.index.word(random.choice(top)) if top else None
+
+    def iter_session(self, max_depth, exclude=(), min_len=4, max_len=10, rng=random):
+        """Yield distinct (word, hint) pairs, one per seed visited in random order
+
+        Seeds are revisited in further passes while they keep producing new
+        words, so the generator only ends once every reachable word is used.
+        """
+        rings = self.rings
+        index = rings.index
+        used = {i for i in map(index.lookup, exclude) if i >= 0}
+        found = True
+        skipped = 0
+        while found:
+            found = False
+            for seed in index.iter_seeds(rng):
+                ring = rings.get(seed, max_depth, min_len, max_len)
+                fresh = [i for i in ring if i not in used]
+                if fresh:
+                    pick = rng.choice(fresh)
+                    used.add(pick)
+                    found = True
+                    word = index.word(pick)
+                    if skipped:
+                        # Seeds passed over because their ring had no unused word
+                        TRACE.count('session_seeds_skipped', skipped)
+                        skipped = 0
+                    yield word, self.get_hint(word, index)
+                else:
+                    skipped += 1
+
+    def plan_session(self, difficulty, count, exclude=(), rng=random):
+        """Choose count distinct (word, hint) pairs for a whole game in one call
+
+        Raises ValueError, before the game starts, when the difficulty's word
+        source cannot supply that many unused words.
+        """
+        rule = self.selection_rule(difficulty)
+        if rule is not None:
+            matched = self.buckets().count(rule)
+            if matched < count:
+                raise ValueError(f"The {difficulty} selection rule only matches {matched} words, {count} needed")
+        plan = list(islice(self.session(difficulty, exclude, rng), count))
+        if len(plan) < count:
+            raise ValueError(f"Word bank only has {len(plan)} unused {difficulty} words, {count} needed")
+        return plan
+
+    def session(self, difficulty, exclude=(), rng=random):
+        """Word source for a game: the difficulty's selection rule if configured, else BFS rings"""
+        rule = self.selection_rule(difficulty)
+        if rule is None:
+            return self.iter_session(DIFFICULTY_SETTINGS[difficulty]['max_depth'], exclude, rng=rng)
+        return self.iter_rule_session(rule, exclude, rng)
+
+    def iter_rule_session(self, rule, exclude=(), rng=random):
+        """Yield distinct (word, hint) pairs drawn uniformly from a selection rule's slice"""
+        buckets = self.buckets()
+        for i in buckets.sample(rule, exclude, rng):
+            word = buckets.index.word(i)
+            yield word, self.get_hint(word, buckets.index)
+
+    def selection_rule(self, difficulty):
+        """Selection rule for a difficulty from <bank>.rules.json, falling back to DIFFICULTY_SETTINGS
+
+        Raises ValueError for a malformed rule, or one on calibrated difficulty
+        when the bank has not been calibrated, before any word is drawn.
+        """
+        if self._rules is None:
+            path = selection_rules_path(self.filepath)
+            try:
+                with open(path, encoding='utf-8') as f:
+                    rules = json.load(f)
+            except OSError:
+                rules = {}
+            except ValueError as e:
+                raise ValueError(f"{path}: {e}") from None
+            if not isinstance(rules, dict):
+                raise ValueError(f"{path}: expected an object mapping difficulties to rules")
+            self._rules = rules
+        rule = self._rules.get(difficulty, DIFFICULTY_SETTINGS[difficulty].get('select'))
+        if rule is not None:
+            check_selection_rule(rule)
+            self.difficulty('')  # loads calibrated scores, if any
+            if 'difficulty' in rule and not self._difficulty:
+                raise ValueError(f"The {difficulty} selection rule needs calibrated difficulty; "
+                                 "run the calibrate command first")
+        return rule
+
+    def buckets(self, wait=True):
+        """Length and difficulty index of the playable words, built on first use
+
+        With wait=False this never builds or blocks and returns None until the
+        buckets for the current snapshot are ready.
+        """
+        buckets = self._buckets
+        index = self.rings.index
+        if buckets is not None and buckets.index is index:
+            return buckets
+        if not wait:
+            return None
+        with self._buckets_lock:
+            buckets = self._buckets
+            if buckets is not None and buckets.index is index:
+                return buckets
+            self.difficulty('')  # loads calibrated scores, if any
+            with TRACE.span('FileBFS.buckets'):
+                if isinstance(index, _PatchedIndex):
+                    base = self._base_buckets
+                    if base is None or base.index is not index.base:
+                        base = self._base_buckets = WordBuckets(index.base, self._difficulty)
+                    buckets = WordBuckets(index, self._difficulty, base)
+                else:
+                    buckets = self._base_buckets = WordBuckets(index, self._difficulty)
+                self._buckets = buckets
+        return buckets
+
+    def difficulty(self, word):
+        """Calibrated difficulty of a word from 0 (easy) to 1, or None if not calibrated"""
+        if self._difficulty is None:
+            self._difficulty = {}
+            try:
+                with open(difficulty_path(self.filepath), newline='', encoding='utf-8') as f:
+                    for row in csv.DictReader(f):
+                        self._difficulty[row['word']] = float(row['difficulty'])
+            except OSError:
+                pass
+        return self._difficulty.get(word.lower())
+
+    def synonyms(self, word):
+        """Other answers accepted for a word, listed in <bank>.synonyms.csv"""
+        if self._synonyms is None:
+            self._synonyms = {}
+            try:
+                with open(synonyms_path(self.filepath), newline='', encoding='utf-8') as f:
+                    for row in csv.DictReader(f):
+                        self._synonyms[row['word'].strip().lower()] = tuple(
+                            s.strip().lower() for s in row['synonyms'].split(';') if s.strip())
+            except OSError:
+                pass
+        return self._synonyms.get(word.lower(), ())
+
+    def word_finder(self, wait=True):
+        """Near-miss index over the bank, built on first use
+
+        With wait=False this never builds or blocks and returns None until an
+        index for the current snapshot is ready. Sharded banks have none, as
+        indexing every word would open every shard.
+        """
+        index = self.rings.index
+        if isinstance(index, ShardedIndex):
+            return None
+        finder = self._finder
+        if finder is not None and finder.index is index:
+            return finder
+        if not wait:
+            return None
+        with self._finder_lock:
+            finder = self._finder
+            if finder is None or finder.index is not index:
+                with TRACE.span('FileBFS.word_finder'):
+                    if isinstance(index, _PatchedIndex):
+                        # Only the patch's rows are indexed; the base's postings are shared
+                        base = self._base_finder
+                        if base is None or base.index is not index.base:
+                            base = self._base_finder = WordFinder(index.base)
+                        finder = WordFinder(index, base)
+                    else:
+                        finder = self._base_finder = WordFinder(index)
+                    self._finder = finder
+        return finder
+
+    @traced('FileBFS.get_hint')
+    def get_hint(self, word, index=None):
+        word = word.lower()
+        if index is None:
+            index = self.rings.index
+        i = index.lookup(word)
+        hint = index.hint(i) if i >= 0 else None
+        if hint:
+            # Return the hint but make sure it doesn't contain the actual word
+            segments = _hint_segments(word, hint)
+            if len(segments) > 1:
+                # Replace the word and its inflected forms with "it" or "this word"
+                hint = random.choice(HINT_REPLACEMENTS).join(segments)
+                hint = hint[0].upper() + hint[1:]  # Capitalize first letter
+            return hint
+        TRACE.count('hint_fallbacks')
+        return "Think about this word carefully."
+
+# --- Fuzzy Answer Matching ---
+def _lcs_at_least(a, b, need, check_every=8):
+    """Whether a and b share a common subsequence of need characters, bit-parallel over a
+
+    Every check_every characters of b, stops once need is reached or once the
+    characters still to come could no longer make up the difference. Words
+    shorter than that run straight through, as counting bits costs more
+    than the few steps it could save.
+    """
+    masks = {}
+    for i, ch in enumerate(a):
+        masks[ch] = masks.get(ch, 0) | (1 << i)
+    full = (1 << len(a)) - 1
+    v = full
+    left = len(b)
+    for ch in b:
+        u = v & masks.get(ch, 0)
+        v = (v + u) | (v - u)
+        left -= 1
+        # Until fewer than need characters remain, any LCS so far could still get there
+        if left % check_every == 0 and left and left < need:
+            lcs = len(a) - bin(v & full).count('1')
+            if lcs >= need or lcs + left < need:
+                return lcs >= need
+    return len(a) - bin(v & full).count('1') >= need
+
+
+@lru_cache(maxsize=1024)
+def _lcs_needed(total, threshold):
+    """Smallest LCS that scores threshold for strings of total length, rounded as the score is"""
+    need = max(0, int(threshold * total / 200) - 1)
+    while int(round(100 * (2.0 * need / total))) < threshold:
+        need += 1
+    return need
+
+
+def fuzzy_match(guess, answer, threshold=80):
+    """True when the indel similarity of guess and answer scores at least threshold
+
+    The score is round(100 * 2 * LCS / (len(guess) + len(answer))), the ratio
+    fuzz.ratio computes when python-Levenshtein is installed. Without it,
+    fuzzywuzzy falls back to difflib, whose matching blocks are not always a
+    longest common subsequence, so a few decisions differ (bench-match counts
+    them). The length difference settles most answers; otherwise the LCS is
+    only followed until the threshold is reached or out of reach.
+    """
+    if guess == answer:
+        return True
+    if not guess or not answer:
+        return threshold <= 0
+    total = len(guess) + len(answer)
+    # Even a perfect overlap of the shorter string is not enough
+    if int(round(100 * (2.0 * min(len(guess), len(answer)) / total))) < threshold:
+        return False
+    short, long_ = (guess, answer) if len(guess) <= len(answer) else (answer, guess)
+    return _lcs_at_least(short, long_, _lcs_needed(total, threshold))
+
+
+def _typo(word, rng, max_edits=3):
+    """Misspell word with up to max_edits random inserts, deletes, replacements or swaps"""
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    guess = list(word)
+    for _ in range(rng.randint(0, max_edits)):
+        pos = rng.randrange(len(guess) + 1)
+        edit = rng.choice(('insert', 'delete', 'replace', 'swap'))
+        if edit == 'insert' or not guess:
+            guess.insert(pos, rng.choice(letters))
+        elif edit == 'delete':
+            del guess[min(pos, len(guess) - 1)]
+        elif edit == 'replace':
+            guess[min(pos, len(guess) - 1)] = rng.choice(letters)
+        elif pos < len(guess) - 1:
+            guess[pos], guess[pos + 1] = guess[pos + 1], guess[pos]
+    return ''.join(guess)
+
+
+def _typo_cases(words, pairs, rng):
+    """(guess, answer) pairs: mostly typos of the answer, some of another word"""
+    cases = []
+    for _ in range(pairs):
+        word = rng.choice(words)
+        cases.append((_typo(word, rng), word if rng.random() < 0.8 else rng.choice(words)))
+    return cases
+
+
+def bench_fuzzy_match(words, pairs=50_000, seed=0):
+    """Time fuzzy_match against fuzz.ratio on typo'd guesses and count disagreements"""
+    cases = _typo_cases(words, pairs, random.Random(seed))
+
+    start = time.perf_counter()
+    ours = [fuzzy_match(g, w) for g, w in cases]
+    result = {'pairs': pairs, 'fuzzy_match_per_sec': pairs / (time.perf_counter() - start)}
+    try:
+        from fuzzywuzzy import fuzz
+    except ImportError:
+        return result
+    start = time.perf_counter()
+    theirs = [fuzz.ratio(g, w) >= 80 for g, w in cases]
+    result['fuzz_ratio_per_sec'] = pairs / (time.perf_counter() - start)
+    result['disagreements'] = sum(a != b for a, b in zip(ours, theirs))
+    return result
+
+
+# --- Near-Miss Suggestions ---
+def _edit_distance(a, b, limit):
+    """Levenshtein distance of a and b, bit-parallel over a, capped at limit + 1"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    if not a:
+        return min(len(b), limit + 1)
+    masks = {}
+    for i, ch in enumerate(a):
+        masks[ch] = masks.get(ch, 0) | (1 << i)
+    full = (1 << len(a)) - 1
+    last = 1 << (len(a) - 1)
+    pv, mv, score = full, 0, len(a)
+    for j, ch in enumerate(b):
+        eq = masks.get(ch, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & full)
+        mh = pv & xh
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        if score - (len(b) - j - 1) > limit:
+            return limit + 1
+        ph = ((ph << 1) | 1) & full
+        mh = (mh << 1) & full
+        pv = mh | (~(xv | ph) & full)
+        mv = ph & xv
+    return min(score, limit + 1)
+
+
+def typo_allowance(length):
+    """Edits a guess of this length may contain and still count as a near miss"""
+    return 0 if length < 3 else 1 if length < 6 else 2
+
+
+def _trigrams(word):
+    """(trigram, position) pairs of the word padded with two markers at each end"""
+    padded = f'^^{word}$$'
+    return [(padded[i:i + 3], i) for i in range(len(padded) - 2)]
+
+
+class WordFinder:
+    """Positional trigram index over the bank's words for finding the nearest ones to a guess
+
+    Each edit breaks at most three of the guess's trigrams and shifts the rest
+    by at most one place, so a word within k edits still has all but 3k of
+    them, each within k places of where the guess has it. Only the 3k + 2
+    rarest trigrams are looked up, and only words found for two of them are
+    compared with the exact (bounded) edit distance. A guess too short to
+    have more than 3k trigrams rules nothing out that way, so it is compared
+    with every word within k letters of its length instead.
+
+    Given base, the finder over the index a _PatchedIndex patches, only the
+    rows the patch adds are indexed; lookups also search the base and skip
+    the rows the patch removes.
+    """
+
+    def __init__(self, index, base=None):
+        self.index = index
+        self._base = base
+        self._removed = index.removed if base is not None else frozenset()
+        postings = {}
+        by_length = {}
+        for i in (index.added_ids() if base is not None else index.row_ids()):
+            word = index.word(i)
+            for key in _trigrams(word):
+                ids = postings.get(key)
+                if ids is None:
+                    ids = postings[key] = array('I')
+                ids.append(i)
+            ids = by_length.get(len(word))
+            if ids is None:
+                ids = by_length[len(word)] = array('I')
+            ids.append(i)
+        self._postings = postings
+        self._by_length = by_length
+
+    def nearest(self, guess, max_distance=None, limit=3):
+        """Up to limit (distance, word) pairs within max_distance edits of guess, closest first"""
+        if max_distance is None:
+            max_distance = typo_allowance(len(guess))
+        sources = [self._postings] if self._base is None else [self._postings, self._base._postings]
+        shifts = range(-max_distance, max_distance + 1)
+        lists = [[postings[(gram, pos + d)] for postings in sources for d in shifts if (gram, pos + d) in postings]
+                 for gram, pos in _trigrams(guess)]
+        lists.sort(key=lambda found: sum(map(len, found)))
+        lists = lists[:3 * max_distance + 2]
+        need = len(lists) - 3 * max_distance
+        if need > 0:
+            counts = Counter()
+            for found in lists:
+                # A word holding the trigram at two nearby places still counts once
+                counts.update(set().union(*found) if len(found) > 1 else found[0] if found else ())
+            candidates = (i for i, shared in counts.items() if shared >= need)
+        else:
+            lengths = range(len(guess) - max_distance, len(guess) + max_distance + 1)
+            tables = [self._by_length] if self._base is None else [self._by_length, self._base._by_length]
+            candidates = chain.from_iterable(table.get(n, ()) for table in tables for n in lengths)
+        word = self.index.word
+        removed = self._removed
+        matches = []
+        for i in candidates:
+            if i in removed:
+                continue
+            candidate = word(i)
+            distance = _edit_distance(guess, candidate, max_distance)
+            if distance <= max_distance:
+                matches.append((distance, candidate))
+        matches.sort()
+        return matches[:limit]
+
+
+# --- Background Word Prefetch ---
+class WordPrefetcher:
+    """Keeps the next few (word, hint) pairs of the current game ready on one worker thread
+
+    Every start() or cancel() bumps a generation counter; work and callbacks
+    belonging to an older generation are dropped instead of delivered.
+    """
+
+    def __init__(self, datasource, dispatch, depth=3):
+        self.datasource = datasource
+        self.dispatch = dispatch  # runs a callable on the UI thread
+        self.depth = depth
+        self._executor = None  # created by the first fill, off the startup path
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._session = None
+        self._ready = deque()
+        self._exhausted = False
+        self._filling = False
+        self._waiter = None
+        self.error = None  # why the current game's word source stopped, if it failed
+
+    def start(self, difficulty, exclude=(), words=None):
+        """Begin prefetching words for a new game, or handing out words already planned for it"""
+        with self._lock:
+            self._generation += 1
+            self._session = iter(words) if words is not None else self.datasource.session(difficulty, exclude)
+            self._ready.clear()
+            self._exhausted = False
+            self._waiter = None
+            self.error = None
+            self._schedule_fill()
+
+    def cancel(self):
+        """Abandon the current game; nothing more will be delivered for it"""
+        with self._lock:
+            self._generation += 1
+            self._session = None
+            self._ready.clear()
+            self._waiter = None
+
+    def take(self, callback):
+        """Hand the next pair to callback, now if one is ready (returns True) or later
+
+        callback receives None once the word bank has no unused words left, or
+        when the word source failed (error then says why). A newer take()
+        replaces a still-pending one, so repeated calls never stack.
+        """
+        with self._lock:
+            if self._ready:
+                pair = self._ready.popleft()
+                self._schedule_fill()
+            elif self._exhausted:
+                pair = None
+            else:
+                TRACE.count('prefetch_waits')
+                self._waiter = callback
+                self._schedule_fill()
+                return False
+        callback(pair)
+        return True
+
+    def shutdown(self):
+        self.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+    def _schedule_fill(self):
+        # Caller holds the lock; at most one fill job is queued at a time
+        if not self._filling and not self._exhausted and self._session is not None:
+            self._filling = True
+            if self._executor is None:
+                from concurrent.futures import ThreadPoolExecutor
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='word-prefetch')
+            self._executor.submit(self._fill, self._generation, self._session)
+
+    def _fill(self, generation, session):
+        try:
+            while True:
+                with self._lock:
+                    if generation != self._generation or len(self._ready) >= self.depth:
+                        break
+                error = None
+                try:
+                    with TRACE.span('prefetch.next_word'):
+                        pair = next(session, None)
+                except Exception as e:
+                    # A failing word source ends the game like an empty one, instead of stalling it
+                    TRACE.count('prefetch_errors')
+                    pair, error = None, str(e) or type(e).__name__
+                with self._lock:
+                    if generation != self._generation:
+                        break
+                    if pair is None:
+                        TRACE.count('word_bank_exhausted')
+                        self._exhausted = True
+                        self.error = error
+                    else:
+                        self._ready.append(pair)
+                    waiter = self._waiter
+                    self._waiter = None
+                    if waiter is not None:
+                        delivered = self._ready.popleft() if self._ready else None
+                # Outside the lock: dispatch may block until the UI thread, which also takes it, runs
+                if waiter is not None:
+                    self.dispatch(lambda cb=waiter, pair=delivered: self._deliver(generation, cb, pair))
+                if pair is None:
+                    break
+        finally:
+            with self._lock:
+                self._filling = False
+                # Covers a newer game started while this job was still running
+                if len(self._ready) < self.depth:
+                    self._schedule_fill()
+
+    def _deliver(self, generation, callback, pair):
+        if generation == self._generation:
+            callback(pair)
+
+
+# --- Headless Game Engine ---
+DIFFICULTY_SETTINGS = {
+    "Easy": {'max_depth': 1, 'time_limit': 30, 'lifelines': 2},
+    "Medium": {'max_depth': 2, 'time_limit': 25, 'lifelines': 1},
+    "Hard": {'max_depth': 3, 'time_limit': 20, 'lifelines': 1},
+}
+
+
+class GameEngine:
+    """Game rules without any UI: masking, lifelines, the countdown and scoring
+
+    The engine never sleeps or schedules callbacks. Time comes from the
+    injected clock and randomness from the injected rng, so a Tk view, a
+    server or a simulator can all drive it step by step.
+    """
+
+    def __init__(self, difficulty, total_questions=10, clock=time.monotonic, rng=random):
+        settings = DIFFICULTY_SETTINGS[difficulty]
+        self.difficulty = difficulty
+        self.max_depth = settings['max_depth']
+        self.time_limit = settings['time_limit']
+        self.clock = clock
+        self.rng = rng
+        self.total_questions = total_questions
+        self.current_question = 0
+        self.score = 0
+        self.correct_streak = 0
+        self.wrong_streak = 0
+        # total lifelines across the entire game
+        self.total_lifelines = 10
+        self.lifelines = settings['lifelines']
+        self.word = None
+        self.hint = None
+        self.synonyms = ()
+        self.display_word = None
+        self.used_words = set()
+        self.started_at = None
+        self.paused_at = None
+        # 'waiting' for a word, 'playing', then 'correct', 'wrong' or 'timeout'
+        self.phase = 'waiting'
+
+    @property
+    def masked_word(self):
+        return " ".join(self.display_word)
+
+    def snapshot(self):
+        """Progress of the game as JSON-ready data; an unanswered question is not counted"""
+        answered = self.phase in ('correct', 'wrong', 'timeout')
+        return {
+            'difficulty': self.difficulty,
+            'total_questions': self.total_questions,
+            'completed_questions': self.current_question if answered else max(0, self.current_question - 1),
+            'score': self.score,
+            'correct_streak': self.correct_streak,
+            'wrong_streak': self.wrong_streak,
+            'total_lifelines': self.total_lifelines,
+            'used_words': sorted(self.used_words),
+        }
+
+    @classmethod
+    def restore(cls, state, clock=time.monotonic, rng=random):
+        """Engine for a game saved with snapshot(), waiting for its next question"""
+        engine = cls(state['difficulty'], state['total_questions'], clock=clock, rng=rng)
+        engine.current_question = state['completed_questions']
+        engine.score = state['score']
+        engine.correct_streak = state['correct_streak']
+        engine.wrong_streak = state['wrong_streak']
+        engine.total_lifelines = state['total_lifelines']
+        engine.used_words = set(state['used_words'])
+        return engine
+
+    def next_question(self):
+        """Move on to the next question; False once the game is over"""
+        if self.current_question >= self.total_questions:
+            return False
+        self.current_question += 1
+        self.phase = 'waiting'
+        return True
+
+    def set_word(self, word, hint, synonyms=()):
+        """Start the current question with this word and start its countdown"""
+        self.word = word
+        self.hint = hint
+        self.synonyms = tuple(synonyms)
+        self.used_words.add(word)
+        self.display_word = ['_' if c.isalpha() else c for c in word]
+        # auto-reveal 2 letters at start of each question
+        hidden_indices = [i for i, ch in enumerate(self.display_word) if ch == '_']
+        self.rng.shuffle(hidden_indices)
+        for idx in hidden_indices[:2]:
+            self.display_word[idx] = word[idx]
+        # reset per-question lifeline from remaining pool
+        self.lifelines = 1 if self.total_lifelines > 0 else 0
+        self.started_at = self.clock()
+        self.paused_at = None
+        self.phase = 'playing'
+
+    @property
+    def paused(self):
+        return self.paused_at is not None
+
+    def pause(self):
+        """Stop the countdown of the current question until resume()"""
+        if self.phase == 'playing' and self.paused_at is None:
+            self.paused_at = self.clock()
+
+    def resume(self):
+        if self.paused_at is not None:
+            # Move the start forward by the pause so the deadline does too
+            self.started_at += self.clock() - self.paused_at
+            self.paused_at = None
+
+    def elapsed(self):
+        """Exact seconds the current question has been running, excluding pauses"""
+        if self.started_at is None:
+            return 0.0
+        now = self.paused_at if self.paused_at is not None else self.clock()
+        return now - self.started_at
+
+    def remaining(self):
+        """Exact seconds left before the current question times out"""
+        return max(0.0, self.time_limit - self.elapsed())
+
+    def time_left(self):
+        """Whole seconds left on the countdown of the current question"""
+        return max(0, self.time_limit - int(self.elapsed()))
+
+    def tick(self):
+        """Expire the question when its time has run out; True on the tick that does so"""
+        if self.phase == 'playing' and not self.paused and self.remaining() <= 0:
+            self.phase = 'timeout'
+            self.wrong_streak += 1
+            self.correct_streak = 0
+            return True
+        return False
+
+    def submit(self, guess):
+        """Score a guess: returns 'empty', 'correct' or 'wrong' (None if not accepting guesses)"""
+        guess = guess.strip().lower()
+        if not guess:
+            return 'empty'
+        if self.phase != 'playing' or self.paused:
+            return None
+        if fuzzy_match(guess, self.word, threshold=80) or any(  # Close enough match
+                fuzzy_match(guess, synonym, threshold=80) for synonym in self.synonyms):
+            self.score += max(5, int(self.remaining()) // 2)  # Bonus points for speed
+            self.correct_streak += 1
+            self.wrong_streak = 0
+            self.phase = 'correct'
+        else:
+            self.wrong_streak += 1
+            self.correct_streak = 0
+            self.phase = 'wrong'
+        return self.phase
+
+    def use_lifeline(self):
+        """Reveal a random hidden letter; returns its index, or None if not allowed"""
+        # only allow if overall pool and this question both have lifelines
+        if self.phase != 'playing' or self.total_lifelines <= 0 or self.lifelines <= 0:
+            return None
+        hidden_indices = [i for i, letter in enumerate(self.display_word) if letter == '_']
+        if not hidden_indices:
+            return None
+        idx = self.rng.choice(hidden_indices)
+        self.display_word[idx] = self.word[idx]
+        # consume one from the overall pool and disable for this question
+        self.total_lifelines -= 1
+        self.lifelines = 0
+        return idx
+
+
+class _ManualClock:
+    """Clock for simulations that only moves when advanced"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def simulate_games(datasource, games=1000, difficulty="Medium", skill=0.7, seed=0):
+    """Play games headlessly with a simple random player and summarize the outcome
+
+    Each question the player thinks for a random time, may use its lifeline,
+    then types the word (with probability skill, else a wrong guess).
+    """
+    rng = random.Random(seed)
+    clock = _ManualClock()
+    scores = []
+    outcomes = {'correct': 0, 'wrong': 0, 'timeout': 0}
+    start = time.perf_counter()
+    for _ in range(games):
+        engine = GameEngine(difficulty, clock=clock, rng=rng)
+        session = datasource.session(difficulty, rng=rng)
+        while engine.next_question():
+            word, hint = next(session)
+            engine.set_word(word, hint)
+            if rng.random() < 0.3:
+                engine.use_lifeline()
+            clock.now += rng.uniform(1, engine.time_limit * 1.2)
+            if not engine.tick():
+                engine.submit(word if rng.random() < skill else word[::-1] + 'x')
+            outcomes[engine.phase] += 1
+        scores.append(engine.score)
+    elapsed = time.perf_counter() - start
+    return {
+        'games': games,
+        'games_per_sec': games / elapsed,
+        'mean_score': sum(scores) / games,
+        'outcomes': outcomes,
+    }
+
+
+# --- Multi-Session Game Server ---
+class GameSession:
+    """One player's game on the server: an engine plus its word stream and timers"""
+
+    def __init__(self, sid, engine, words):
+        self.id = sid
+        self.engine = engine
+        self.words = words
+        self.timer = None
+        self.advance = None
+        self.last_seen = engine.clock()
+
+    def cancel_timers(self):
+        for handle in (self.timer, self.advance):
+            if handle is not None:
+                handle.cancel()
+        self.timer = self.advance = None
+
+
+class GameServer:
+    """Hosts many concurrent games over a small HTTP/JSON API on one asyncio loop
+
+    Every session shares the same read-only FileBFS. Question timeouts and the
+    auto-advance after a correct answer are loop.call_later timers, so an idle
+    session costs no CPU at all.
+
+        POST   /sessions                 {"difficulty": "Easy"}  start a game
+        GET    /sessions/<id>            current state
+        POST   /sessions/<id>/guess      {"guess": "..."}
+        POST   /sessions/<id>/lifeline   reveal a letter
+        POST   /sessions/<id>/next       skip to the next word
+        DELETE /sessions/<id>            end the game
+    """
+
+    def __init__(self, datasource, idle_timeout=600):
+        self.datasource = datasource
+        self.idle_timeout = idle_timeout
+        self.sessions = {}
+        self._next_id = 0
+        self.loop = None
+
+    async def serve(self, host='127.0.0.1', port=8765):
+        import asyncio
+        self.loop = asyncio.get_running_loop()
+        server = await asyncio.start_server(self._handle, host, port, backlog=4096)
+        self.loop.call_later(self.idle_timeout, self._reap_idle)
+        return server
+
+    # -- game flow --
+    def create(self, difficulty):
+        engine = GameEngine(difficulty, clock=self.loop.time)
+        self._next_id += 1
+        sid = f"{self._next_id:x}"
+        # Planned up front, so a bank that can't fill the game is refused with a 400
+        session = GameSession(sid, engine, iter(self.datasource.plan_session(difficulty, engine.total_questions)))
+        self.sessions[sid] = session
+        self._advance(session)
+        return session
+
+    def _advance(self, session):
+        session.cancel_timers()
+        engine = session.engine
+        if not engine.next_question():
+            return
+        pair = next(session.words, None)
+        if pair is None:
+            raise LookupError("Word bank has run out of unused words for this difficulty")
+        engine.set_word(*pair, self.datasource.synonyms(pair[0]))
+        self._arm_timer(session)
+
+    def _arm_timer(self, session):
+        engine = session.engine
+        session.timer = self.loop.call_later(engine.remaining() + 0.001, self._expire, session)
+
+    def _expire(self, session):
+        session.timer = None
+        if session.engine.phase == 'playing' and not session.engine.tick():
+            self._arm_timer(session)  # woke up a hair early
+
+    def _auto_advance(self, session):
+        session.advance = None
+        try:
+            self._advance(session)
+        except LookupError:
+            pass
+
+    def _reap_idle(self):
+        cutoff = self.loop.time() - self.idle_timeout
+        for sid in [sid for sid, s in self.sessions.items() if s.last_seen < cutoff]:
+            self.sessions.pop(sid).cancel_timers()
+        self.loop.call_later(self.idle_timeout, self._reap_idle)
+
+    def state(self, session):
+        engine = session.engine
+        over = engine.current_question >= engine.total_questions and engine.phase != 'playing'
+        state = {
+            'session': session.id,
+            'difficulty': engine.difficulty,
+            'question': engine.current_question,
+            'total_questions': engine.total_questions,
+            'phase': engine.phase,
+            'hint': engine.hint,
+            'masked': engine.masked_word if engine.display_word else '',
+            'time_left': engine.time_left() if engine.phase == 'playing' else 0,
+            'score': engine.score,
+            'lifelines': engine.lifelines,
+            'total_lifelines': engine.total_lifelines,
+            'finished': over,
+        }
+        if engine.phase in ('correct', 'wrong', 'timeout'):
+            state['word'] = engine.word
+        return state
+
+    def route(self, method, path, body):
+        """Dispatch one API call, returning (status, payload)"""
+        parts = [p for p in path.split('/') if p]
+        if parts == ['sessions'] and method == 'POST':
+            difficulty = body.get('difficulty', 'Medium')
+            if difficulty not in DIFFICULTY_SETTINGS:
+                return 400, {'error': f"Unknown difficulty {difficulty!r}"}
+            return 201, self.state(self.create(difficulty))
+        if len(parts) < 2 or parts[0] != 'sessions':
+            return 404, {'error': 'Not found'}
+        session = self.sessions.get(parts[1])
+        if session is None:
+            return 404, {'error': 'No such session'}
+        session.last_seen = self.loop.time()
+        engine = session.engine
+        action = parts[2] if len(parts) > 2 else None
+
+        if action is None and method == 'GET':
+            return 200, self.state(session)
+        if action is None and method == 'DELETE':
+            self.sessions.pop(session.id).cancel_timers()
+            return 200, {'session': session.id, 'deleted': True}
+        if method != 'POST':
+            return 405, {'error': 'Method not allowed'}
+        if action == 'guess':
+            result = engine.submit(str(body.get('guess', '')))
+            if result is None:
+                return 409, {'error': 'Not accepting guesses', **self.state(session)}
+            if result != 'empty':
+                session.cancel_timers()
+                if result == 'correct':
+                    # Auto-proceed to next word after delay, like the desktop game
+                    session.advance = self.loop.call_later(2.0, self._auto_advance, session)
+            return 200, {'result': result, **self.state(session)}
+        if action == 'lifeline':
+            return 200, {'revealed': engine.use_lifeline(), **self.state(session)}
+        if action == 'next':
+            self._advance(session)
+            return 200, self.state(session)
+        return 404, {'error': 'Not found'}
+
+    # -- HTTP plumbing --
+    async def _handle(self, reader, writer):
+        import asyncio
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, version = request_line.decode('latin-1').split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get('content-length', 0))
+                raw = await reader.readexactly(length) if length else b''
+                try:
+                    status, payload = self.route(method, path, json.loads(raw) if raw else {})
+                except (ValueError, AttributeError) as e:
+                    status, payload = 400, {'error': str(e)}
+                except LookupError as e:
+                    status, payload = 409, {'error': str(e)}
+                data = json.dumps(payload).encode('utf-8')
+                keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                writer.write(
+                    f"HTTP/1.1 {status} {HTTP_REASONS.get(status, 'OK')}\r\n"
+                    f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+HTTP_REASONS = {200: 'OK', 201: 'Created', 400: 'Bad Request', 404: 'Not Found',
+                405: 'Method Not Allowed', 409: 'Conflict'}
+
+
+async def _http_json(reader, writer, method, path, body=None):
+    data = json.dumps(body).encode('utf-8') if body is not None else b''
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(data)}\r\n\r\n".encode('latin-1') + data)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.lower() == 'content-length':
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+async def run_load_test(host, port, sessions=2000, connections=200, difficulty='Medium', seed=0):
+    """Open many concurrent sessions, then play them all to the end over a connection pool"""
+    import asyncio
+    rng = random.Random(seed)
+    latencies = []
+    errors = 0
+    ids = asyncio.Queue()
+    turns = asyncio.Queue()
+    finished = []
+
+    async def call(conn, method, path, body=None):
+        nonlocal errors
+        start = time.perf_counter()
+        status, payload = await _http_json(*conn, method, path, body)
+        latencies.append(time.perf_counter() - start)
+        if status >= 400 and status != 409:
+            errors += 1
+        return status, payload
+
+    async def opener(conn, count):
+        for _ in range(count):
+            status, state = await call(conn, 'POST', '/sessions', {'difficulty': difficulty})
+            if status == 201:
+                await ids.put(state['session'])
+
+    async def player(conn):
+        # Each turn plays one question of one session, so every session stays live at once
+        while True:
+            sid = await turns.get()
+            if sid is None:
+                return
+            base = f"/sessions/{sid}"
+            if rng.random() < 0.3:
+                await call(conn, 'POST', base + '/lifeline')
+            status, state = await call(conn, 'POST', base + '/guess', {'guess': _typo('guess', rng)})
+            status, state = await call(conn, 'POST', base + '/next')
+            if state.get('finished'):
+                await call(conn, 'DELETE', base)
+                finished.append(sid)
+            else:
+                turns.put_nowait(sid)
+            if len(finished) == opened:
+                for _ in range(connections):
+                    turns.put_nowait(None)
+
+    conns = [await asyncio.open_connection(host, port) for _ in range(connections)]
+    start = time.perf_counter()
+    per_conn = [sessions // connections + (i < sessions % connections) for i in range(connections)]
+    await asyncio.gather(*(opener(c, n) for c, n in zip(conns, per_conn)))
+    opened = ids.qsize()
+    while not ids.empty():
+        turns.put_nowait(ids.get_nowait())
+    if opened:
+        await asyncio.gather(*(player(c) for c in conns))
+    elapsed = time.perf_counter() - start
+    for _, writer in conns:
+        writer.close()
+    latencies.sort()
+    return {
+        'sessions': opened,
+        'completed': len(finished),
+        'requests': len(latencies),
+        'errors': errors,
+        'requests_per_sec': len(latencies) / elapsed,
+        'p50_ms': latencies[len(latencies) // 2] * 1e3,
+        'p99_ms': latencies[int(len(latencies) * 0.99)] * 1e3,
+    }
 
-    def get_word(self, start, max_depth=1, min_len=4, max_len=10):
-        visited = set()
-        queue = deque([(start.lower(), 0)])
-        candidates = []
-        while queue:
-            node, depth = queue.popleft()
-            if node in visited:
-                continue
-            visited.add(node)
-            if node in self.graph:
-                if min_len <= len(node) <= max_len and node.isalpha():
-                    candidates.append((node, depth))
-                if depth < max_depth:
-                    for nbr in self.graph[node]['neighbors']:
-                        if nbr not in visited:
-                            queue.append((nbr, depth + 1))
-        if not candidates:
-            return None
-        max_found = max(d for _, d in candidates) if candidates else 0
-        top = [w for w, d in candidates if d == max_found]
-        return random.choice(top) if top else None
 
-    def get_hint(self, word):
-        word = word.lower()
-        if word in self.graph and self.graph[word]['hint']:
-            # Return the hint but make sure it doesn't contain the actual word
-            hint = self.graph[word]['hint']
-            # Replace the actual word or any form of it with "it" or "this word"
-            # Case-insensitive replacement
-            hint_lower = hint.lower()
-            word_lower = word.lower()
-            
-            if word_lower in hint_lower:
-                replacements = ["this word", "it", "this term", "the answer"]
-                replacement = random.choice(replacements)
-                # Find all occurrences of the word in the hint
-                hint = re.sub(r'\b' + re.escape(word_lower) + r'\b', replacement, hint_lower, flags=re.IGNORECASE)
-                hint = hint[0].upper() + hint[1:]  # Capitalize first letter
-                
-            return hint
-        return "Think about this word carefully."
+# --- Player Stats & Saved Games ---
+def user_data_dir():
+    """Per-user directory for stats and saved games (override with WORD_WIZARD_DATA)"""
+    return _user_dir('data')
+
+
+def _empty_store_state():
+    return {
+        'seq': 0,
+        'log_offset': 0,
+        'stats': {
+            'games': 0, 'wins': 0, 'losses': 0,
+            'answers': 0, 'correct': 0, 'wrong': 0, 'timeouts': 0, 'answer_seconds': 0.0,
+            'streak': 0, 'best_streak': 0, 'best_scores': {},
+        },
+        'saved_game': None,
+    }
+
+
+def _apply_event(state, event):
+    """Fold one logged event into the aggregate state"""
+    stats = state['stats']
+    kind = event['type']
+    if kind == 'answer':
+        result = event['result']
+        stats['answers'] += 1
+        stats['answer_seconds'] += event['seconds']
+        stats[{'correct': 'correct', 'wrong': 'wrong', 'timeout': 'timeouts'}[result]] += 1
+        stats['streak'] = stats['streak'] + 1 if result == 'correct' else 0
+        stats['best_streak'] = max(stats['best_streak'], stats['streak'])
+    elif kind == 'game_end':
+        stats['games'] += 1
+        stats['wins' if event['won'] else 'losses'] += 1
+        best = stats['best_scores']
+        best[event['difficulty']] = max(best.get(event['difficulty'], 0), event['score'])
+        state['saved_game'] = None
+    elif kind == 'save':
+        state['saved_game'] = event['game']
+    elif kind == 'clear_save':
+        state['saved_game'] = None
+    state['seq'] = event['seq']
+
+
+class GameStore:
+    """Player stats and the saved game, kept as an append-only event log plus a snapshot
+
+    record() folds an event into the in-memory aggregates and queues it; a
+    writer thread appends queued events in batches and fsyncs at most once per
+    flush_interval, so the UI thread never waits on disk. Every compact_every
+    events the writer also saves the aggregates with the log offset they
+    cover, and opening the store reads that snapshot plus the log after it
+    instead of replaying the whole history.
+    """
+
+    LOG_NAME = 'events.jsonl'
+    SNAPSHOT_NAME = 'snapshot.json'
+
+    def __init__(self, directory, flush_interval=1.0, compact_every=500):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.compact_every = compact_every
+        self.log_path = os.path.join(directory, self.LOG_NAME)
+        self.snapshot_path = os.path.join(directory, self.SNAPSHOT_NAME)
+        self.state = _empty_store_state()
+        self._pending = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._file = None
+        try:
+            os.makedirs(directory, exist_ok=True)
+            self._load()
+            self._file = open(self.log_path, 'ab')
+        except OSError:
+            return  # unwritable location: stats only last for this run
+        # The writer's copy only ever reflects events already in the log
+        self._durable = json.loads(json.dumps(self.state))
+        self._writer = threading.Thread(target=self._write_loop, daemon=True, name='game-store-writer')
+        self._writer.start()
+
+    @property
+    def saved_game(self):
+        return self.state['saved_game']
+
+    def stats(self):
+        """Aggregate player stats, without replaying the log"""
+        stats = dict(self.state['stats'])
+        stats['avg_answer_seconds'] = stats['answer_seconds'] / stats['answers'] if stats['answers'] else 0.0
+        return stats
+
+    def record(self, kind, **fields):
+        """Log an event; returns at once and the writer thread persists it"""
+        with self._cond:
+            event = {'type': kind, 'seq': self.state['seq'] + 1, 'ts': round(time.time(), 3), **fields}
+            _apply_event(self.state, event)
+            if self._file is not None:
+                self._pending.append(event)
+                self._cond.notify()
+
+    def close(self):
+        """Write out everything queued, fsync and leave a fresh snapshot"""
+        if self._file is None:
+            return
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._writer.join()
+        self._file.close()
+        self._file = None
+
+    def _load(self):
+        try:
+            with open(self.snapshot_path, encoding='utf-8') as f:
+                self.state = json.load(f)
+        except (OSError, ValueError):
+            self.state = _empty_store_state()
+        try:
+            log = open(self.log_path, 'r+b')
+        except FileNotFoundError:
+            return
+        with log:
+            size = log.seek(0, os.SEEK_END)
+            # A log shorter than the snapshot's offset was replaced; replay it by seq instead
+            offset = self.state['log_offset'] if self.state['log_offset'] <= size else 0
+            log.seek(offset)
+            for line in log:
+                try:
+                    event = json.loads(line) if line.endswith(b'\n') else None
+                except ValueError:
+                    event = None
+                if event is None:
+                    break  # torn final write from a crash
+                if event['seq'] > self.state['seq']:
+                    _apply_event(self.state, event)
+                offset += len(line)
+            if offset < size:
+                log.truncate(offset)
+            self.state['log_offset'] = offset
+
+    def _write_loop(self):
+        last_sync = time.monotonic()
+        dirty = False
+        since_snapshot = 0
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    if not dirty:
+                        self._cond.wait()
+                        continue
+                    wait = last_sync + self.flush_interval - time.monotonic()
+                    if wait <= 0:
+                        break
+                    self._cond.wait(wait)
+                batch = list(self._pending)
+                self._pending.clear()
+                closing = self._closed
+            if batch:
+                self._file.write(b''.join(json.dumps(event).encode('utf-8') + b'\n' for event in batch))
+                self._file.flush()
+                for event in batch:
+                    _apply_event(self._durable, event)
+                self._durable['log_offset'] = self._file.tell()
+                since_snapshot += len(batch)
+                dirty = True
+            if dirty and (closing or time.monotonic() - last_sync >= self.flush_interval):
+                with TRACE.span('store.fsync', events=since_snapshot):
+                    os.fsync(self._file.fileno())
+                last_sync = time.monotonic()
+                dirty = False
+                if since_snapshot >= self.compact_every or closing:
+                    self._write_snapshot()
+                    since_snapshot = 0
+            if closing and not dirty:
+                with self._cond:
+                    if not self._pending:
+                        return
+
+    def _write_snapshot(self):
+        try:
+            with _atomic_write(self.snapshot_path, 'w', fsync=True, encoding='utf-8') as f:
+                json.dump(self._durable, f)
+        except OSError:
+            pass  # the log alone still has everything
+
+
+# --- Rendered Badge Cache ---
+# Bump when the rendering changes so stale badges are not reused
+BADGE_RENDER_VERSION = 1
+
+
+def asset_cache_dir():
+    """Per-user directory for rendered assets (override with WORD_WIZARD_CACHE)"""
+    return _user_dir('cache')
+
+
+def badge_cache_path(text, size, bg_color, text_color, font_size, cache_dir=None):
+    """Content-addressed location of a rendered text badge"""
+    spec = json.dumps([BADGE_RENDER_VERSION, text, list(size), bg_color, text_color, font_size])
+    key = hashlib.sha256(spec.encode('utf-8')).hexdigest()[:32]
+    return os.path.join(cache_dir or asset_cache_dir(), f'badge-{key}.png')
+
+
+def render_text_badge(text, size, bg_color, text_color, font_size):
+    """Draw a simple image with text for buttons/logos"""
+    from PIL import Image, ImageDraw, ImageFont
+    img = Image.new('RGBA', size, bg_color)
+    draw = ImageDraw.Draw(img)
+    # Use default font if custom font not available
+    try:
+        font = ImageFont.truetype("Arial Bold", font_size)
+    except (OSError, ImportError):
+        font = ImageFont.load_default()
+
+    # Center text
+    text_width, text_height = draw.textsize(text, font=font) if hasattr(draw, 'textsize') else (size[0]-20, size[1]-10)
+    position = ((size[0]-text_width)/2, (size[1]-text_height)/2)
+    draw.text(position, text, fill=text_color, font=font)
+    return img
+
+
+def load_text_badge(master, text, size, bg_color, text_color, font_size, cache_dir=None):
+    """PhotoImage of a text badge, read from the badge cache and rendered only on a miss"""
+    path = badge_cache_path(text, size, bg_color, text_color, font_size, cache_dir)
+    if os.path.exists(path):
+        try:
+            # Tk decodes PNG itself, so a cache hit never touches PIL
+            return tk.PhotoImage(master=master, file=path)
+        except tk.TclError:
+            pass  # unreadable entry; render it again
+    img = render_text_badge(text, size, bg_color, text_color, font_size)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with _atomic_write(path) as f:
+            img.save(f, 'PNG')
+    except OSError:
+        pass  # read-only cache location: use the rendered image this time only
+    from PIL import ImageTk
+    return ImageTk.PhotoImage(img, master=master)
+
+
+class LazyImages(dict):
+    """Image table that creates each image the first time it is looked up"""
+
+    def __init__(self, factories):
+        super().__init__()
+        self.factories = factories
+
+    def __missing__(self, name):
+        image = self[name] = self.factories[name]()
+        return image
+
 
 # --- Game Animation Effects ---
+class AnimationScheduler:
+    """Runs widget animations from after() callbacks on one shared frame timer
+
+    An animation is a step(t) callback given its progress from 0 to 1. Progress
+    comes from the clock, so a late frame skips ahead instead of stretching the
+    animation. Animations of destroyed widgets are dropped, and when a frame
+    runs over its budget the remaining ones go first on the next frame.
+    """
+
+    def __init__(self, master, frame_ms=16, budget_ms=8, clock=time.perf_counter):
+        self.master = master
+        self.frame_ms = frame_ms
+        self.budget = budget_ms / 1000
+        self.clock = clock
+        self._animations = OrderedDict()  # key -> [widget, step, duration, start, on_done]
+        self._after_id = None
+
+    def animate(self, widget, step, duration, key=None, on_done=None):
+        """Start an animation; one already running under the same key jumps to its end first"""
+        key = key if key is not None else (str(widget), id(step))
+        self.cancel(key)
+        self._animations[key] = [widget, step, duration / 1000, self.clock(), on_done]
+        if self._after_id is None:
+            self._after_id = self.master.after(0, self._frame)
+        return key
+
+    def cancel(self, key, finish=True):
+        """Stop an animation, by default leaving its widget in the final state"""
+        anim = self._animations.pop(key, None)
+        if anim and finish:
+            self._step(anim, 1.0)
+
+    def cancel_all(self):
+        if self._after_id is not None:
+            self.master.after_cancel(self._after_id)
+            self._after_id = None
+        self._animations.clear()
+
+    @property
+    def active(self):
+        return len(self._animations)
+
+    def _step(self, anim, t):
+        widget, step = anim[0], anim[1]
+        try:
+            if widget.winfo_exists():
+                step(t)
+                return True
+        except tk.TclError:
+            pass  # destroyed between the check and the step
+        return False
+
+    def _frame(self):
+        self._after_id = None
+        start = self.clock()
+        deadline = start + self.budget
+        for key in list(self._animations):
+            if self.clock() > deadline:
+                break
+            anim = self._animations[key]
+            duration = anim[2]
+            t = min(1.0, (self.clock() - anim[3]) / duration) if duration > 0 else 1.0
+            if not self._step(anim, t) or t >= 1.0:
+                del self._animations[key]
+                if anim[4] and t >= 1.0:
+                    anim[4]()
+            else:
+                self._animations.move_to_end(key)
+        if self._animations:
+            elapsed_ms = (self.clock() - start) * 1000
+            self._after_id = self.master.after(max(1, int(self.frame_ms - elapsed_ms)), self._frame)
+
+
 class AnimationEffects:
-    @staticmethod
-    def fade_in(widget, duration=500, steps=20):
-        """Gradually fade in a widget"""
-        widget.place_forget() if hasattr(widget, 'place_forget') else widget.pack_forget()
-        widget.update()
-        
-        # Make sure it's visible at 0 opacity first
-        if hasattr(widget, 'place'):
-            widget.place(relx=0.5, rely=0.5, anchor='center')
-        else:
-            widget.pack()
-            
-        for i in range(steps + 1):
-            opacity = i / steps
-            widget.configure(style=f"{widget.cget('style').split('.')[0]}.{opacity}.TLabel")
-            widget.update()
-            time.sleep(duration / 1000 / steps)
-    
-    @staticmethod
-    def highlight_widget(widget, color='#FFD700', duration=300):
+    FADE_LEVELS = 10
+
+    def __init__(self, master, style):
+        self.scheduler = AnimationScheduler(master)
+        self.style = style
+        self._fade_styles = {}
+
+    def _fade_style(self, base, level):
+        """Style for base blended level/FADE_LEVELS of the way from its background to its foreground"""
+        name = self._fade_styles.get((base, level))
+        if name is None:
+            name = f"Fade{level}.{base}"
+            fg = self.style.lookup(base, 'foreground') or '#ffffff'
+            bg = self.style.lookup(base, 'background') or '#000000'
+            self.style.configure(name, foreground=_blend_color(bg, fg, level / self.FADE_LEVELS))
+            self._fade_styles[(base, level)] = name
+        return name
+
+    def fade_in(self, widget, duration=500):
+        """Gradually fade in a widget's text"""
+        base = re.sub(r'^Fade\d+\.', '', str(widget.cget('style'))) or 'TLabel'
+        levels = self.FADE_LEVELS
+
+        def step(t):
+            level = round(t * levels)
+            widget.configure(style=base if level == levels else self._fade_style(base, level))
+        step(0)
+        return self.scheduler.animate(widget, step, duration, key=(str(widget), 'fade'))
+
+    def highlight_widget(self, widget, color='#FFD700', duration=300):
         """Briefly highlight a widget"""
         original_bg = widget.cget('background')
         widget.configure(background=color)
-        widget.update()
-        widget.after(duration, lambda: widget.configure(background=original_bg))
-    
-    @staticmethod
-    def shake_widget(widget, distance=10, cycles=5, duration=50):
+        return self.scheduler.animate(widget, lambda t: t >= 1.0 and widget.configure(background=original_bg),
+                                      duration, key=(str(widget), 'highlight'))
+
+    def shake_widget(self, widget, distance=10, cycles=5, duration=50):
         """Shake a widget left and right"""
-        original_x = widget.winfo_x()
-        for i in range(cycles):
-            widget.place(x=original_x + distance)
-            widget.update()
-            time.sleep(duration / 1000)
-            widget.place(x=original_x - distance)
-            widget.update()
-            time.sleep(duration / 1000)
-        widget.place(x=original_x)
+        if widget.winfo_manager() == 'place':
+            original_x = widget.winfo_x()
+            move = lambda dx: widget.place(x=original_x + dx)
+        else:
+            padx = widget.pack_info().get('padx', 0)
+            parts = [int(p) for p in (padx if isinstance(padx, (tuple, list)) else str(padx).split())]
+            original = (parts[0], parts[-1])
+            move = lambda dx: widget.pack_configure(padx=(max(0, original[0] + dx), max(0, original[1] - dx)))
+
+        def step(t):
+            if t >= 1.0:
+                move(0)
+            else:
+                move(distance if int(t * cycles * 2) % 2 == 0 else -distance)
+        return self.scheduler.animate(widget, step, cycles * 2 * duration, key=(str(widget), 'shake'))
+
+
+def _blend_color(start, end, t):
+    """Mix two #rrggbb colors, t=0 giving start and t=1 giving end"""
+    a = [int(start.lstrip('#')[i:i + 2], 16) for i in (0, 2, 4)]
+    b = [int(end.lstrip('#')[i:i + 2], 16) for i in (0, 2, 4)]
+    return '#' + ''.join(f'{round(x + (y - x) * t):02x}' for x, y in zip(a, b))
+
+# --- Countdown Timer ---
+class CountdownTimer:
+    """Redraws a GameEngine's countdown from after() callbacks without drifting
+
+    The deadline lives in the engine and is read from its monotonic clock, so
+    a late callback only delays a redraw and never adds time. Each callback is
+    scheduled for the moment the shown second changes, at most resolution_ms
+    apart, and on_update only runs when that second actually changes.
+    """
+
+    def __init__(self, master, on_update, on_expire, resolution_ms=250):
+        self.master = master  # anything with Tk's after() and after_cancel()
+        self.on_update = on_update
+        self.on_expire = on_expire
+        self.resolution_ms = resolution_ms
+        self.engine = None
+        self._after_id = None
+        self._shown = None
+
+    @property
+    def running(self):
+        return self._after_id is not None
+
+    def start(self, engine):
+        self.stop()
+        self.engine = engine
+        self._shown = None
+        self._run()
+
+    def stop(self):
+        if self._after_id is not None:
+            self.master.after_cancel(self._after_id)
+            self._after_id = None
+
+    def pause(self):
+        """Freeze a running countdown; True if there was one to pause"""
+        if not self.running:
+            return False
+        self.stop()
+        self.engine.pause()
+        return True
+
+    def resume(self):
+        if self.engine is not None and self.engine.paused:
+            self.engine.resume()
+            self._run()
+
+    def _run(self):
+        self._after_id = None
+        engine = self.engine
+        if engine.tick():
+            self.on_update(0)
+            self.on_expire()
+            return
+        if engine.phase != 'playing':
+            return
+        shown = engine.time_left()
+        if shown != self._shown:
+            self._shown = shown
+            self.on_update(shown)
+        until_change = 1.0 - engine.elapsed() % 1.0
+        delay = min(self.resolution_ms, int(until_change * 1000) + 1)
+        self._after_id = self.master.after(delay, self._run)
+
+
+class _BusyLoop:
+    """Bare after()/after_cancel() event loop on the monotonic clock, for timer checks"""
+
+    def __init__(self):
+        self._queue = []
+        self._seq = 0
+        self._cancelled = set()
+
+    def after(self, ms, fn):
+        import heapq
+        self._seq += 1
+        heapq.heappush(self._queue, (time.monotonic() + ms / 1000, self._seq, fn))
+        return self._seq
+
+    def after_cancel(self, after_id):
+        self._cancelled.add(after_id)
+
+    def run(self, until):
+        import heapq
+        while self._queue and not until():
+            due, seq, fn = heapq.heappop(self._queue)
+            if seq in self._cancelled:
+                continue
+            time.sleep(max(0.0, due - time.monotonic()))
+            fn()
+
+
+def check_timer_accuracy(time_limit=5, busy_ms=150, period_ms=230, resolution_ms=250):
+    """Run a countdown on an event loop that blocks busy_ms out of every period_ms
+
+    Returns how late the timeout and the worst second redraw fired, next to
+    how late a counter of once-per-second after() ticks would have timed out.
+    """
+    loop = _BusyLoop()
+    engine = GameEngine('Easy', total_questions=1)
+    engine.time_limit = time_limit
+    redraws = []
+    expired = []
+    timer = CountdownTimer(loop, lambda shown: redraws.append((time.monotonic(), shown)),
+                           lambda: expired.append(time.monotonic()), resolution_ms)
+
+    def busy():
+        time.sleep(busy_ms / 1000)
+        loop.after(max(0, period_ms - busy_ms), busy)
+
+    ticks = []
+
+    def naive_tick():
+        ticks.append(time.monotonic())
+        loop.after(1000, naive_tick)
+
+    engine.next_question()
+    engine.set_word('wizard', '')
+    start = engine.started_at
+    timer.start(engine)
+    loop.after(1000, naive_tick)
+    loop.after(0, busy)
+    loop.run(until=lambda: bool(expired) and len(ticks) >= time_limit)
+    deadline = start + time_limit
+    return {
+        'timeout_late_ms': (expired[0] - deadline) * 1000,
+        'worst_redraw_late_ms': max((t - (start + time_limit - shown)) * 1000 for t, shown in redraws),
+        'tick_counter_late_ms': (ticks[time_limit - 1] - deadline) * 1000,
+    }
+
 
 # --- Game Logic & Enhanced UI ---
 class WordGuessingGame:
-    def __init__(self, master, word_file='words.csv'):
+    def __init__(self, master, word_file='words.csv', store=None):
         self.master = master
         self.master.title("🧠 Word Wizard: AI Guessing Game 🧠")
         self.master.configure(bg="#1e1e2e")
@@ -120,26 +3138,95 @@ class WordGuessingGame:
         except:
             pass
             
-        self.datasource = FileBFS(word_file)
+        self.datasource = FileBFS(word_file, background=True)
+        self.store = store if store is not None else GameStore(user_data_dir())
+        self.prefetcher = WordPrefetcher(self.datasource, dispatch=lambda fn: self.master.after(0, fn))
+        self._pending_start = None
+        # Auto-advance scheduled after a correct answer
+        self._advance_id = None
+        # Screens are built on first use and then only hidden and shown again
+        self.screens = {}
+        self._current_screen = None
         self.style = ttk.Style()
         self._setup_styles()
+        self.animations = AnimationEffects(self.master, self.style)
+        self.timer = CountdownTimer(self.master, self._show_time_left, self._on_time_up)
         self._load_assets()
         self._init_game_state()
         self.setup_start_menu()
         
         # Add keyboard events
         self.master.bind('<Escape>', lambda e: self.exit_prompt())
+        self.master.bind('<F12>', lambda e: self.toggle_debug_overlay())
+        self._overlay = None
+        self._finder_thread = None  # builds the near-miss index once a guess first needs it
+        self._buckets_thread = None  # sorts the bank for selection rules before their first game
+        self._poll_word_bank()
+        # Pick up edits to the word bank without restarting the game
+        self.datasource.watch(on_reload=lambda summary: self.master.after(
+            0, lambda: self._on_word_bank_reloaded(summary)))
+
+    def toggle_debug_overlay(self):
+        """Show or hide span timings and counters over the current screen"""
+        if self._overlay is not None:
+            self._overlay.destroy()
+            self._overlay = None
+            return
+        TRACE.enable()  # keeps results in memory if no trace file was given
+        self._overlay = tk.Label(self.master, font=('Courier New', 9), justify='left',
+                                 bg='#000000', fg='#50fa7b')
+        self._overlay.place(relx=1.0, rely=0.0, anchor='ne')
+        self._refresh_overlay(self._overlay)
+
+    def _refresh_overlay(self, overlay):
+        if overlay is not self._overlay:
+            return  # hidden, or replaced by a newer overlay
+        lines = [f"{name:<26}{calls:>6} {total / calls * 1000:8.2f} ms"
+                 for name, (calls, total) in sorted(TRACE.totals.items())]
+        lines += [f"{name:<26}{value:>6}" for name, value in sorted(TRACE.counters.items())]
+        overlay.config(text="\n".join(lines) or "Tracing...")
+        overlay.lift()
+        self.master.after(500, lambda: self._refresh_overlay(overlay))
+
+    def _poll_word_bank(self):
+        """Refresh the loading status every 100 ms until the word bank is fully loaded"""
+        self._update_load_status()
+        if not self.datasource.loaded.is_set():
+            self.master.after(100, self._poll_word_bank)
+
+    def _on_word_bank_reloaded(self, summary):
+        label = getattr(self, 'load_status', None)
+        if label is None or not label.winfo_exists():
+            return
+        if 'error' in summary:
+            label.config(text=f"Word bank not reloaded: {summary['error']}")
+        else:
+            label.config(text=f"{self.datasource.word_count():,} words loaded (word bank updated)")
+
+    def _update_load_status(self):
+        label = getattr(self, 'load_status', None)
+        if label is None or not label.winfo_exists():
+            return
+        if self.datasource.load_error:
+            label.config(text=f"Word bank failed to load: {self.datasource.load_error}")
+        elif self.datasource.loaded.is_set():
+            count = self.datasource.word_count()
+            label.config(text=f"{count:,} words loaded" if count is not None else "Word bank ready")
+        else:
+            label.config(text=f"Loading word bank... {self.datasource.progress():.0%}")
 
     def _load_assets(self):
-        """Load images and other assets"""
-        self.images = {}
-        # Create a simple logo if no image available
-        self.images['logo'] = self._create_text_image("WORD WIZARD", (300, 120), "#f9d949", "#1e1e2e", 42)
-        
-        # Create difficulty badges
-        self.images['easy'] = self._create_text_image("EASY", (100, 40), "#4CAF50", "#ffffff", 16)
-        self.images['medium'] = self._create_text_image("MEDIUM", (100, 40), "#FF9800", "#ffffff", 16)
-        self.images['hard'] = self._create_text_image("HARD", (100, 40), "#F44336", "#ffffff", 16)
+        """Register images and other assets; images are created on first display"""
+        def badge(*spec):
+            return lambda: self._create_text_image(*spec)
+        self.images = LazyImages({
+            # Create a simple logo if no image available
+            'logo': badge("WORD WIZARD", (300, 120), "#f9d949", "#1e1e2e", 42),
+            # Create difficulty badges
+            'easy': badge("EASY", (100, 40), "#4CAF50", "#ffffff", 16),
+            'medium': badge("MEDIUM", (100, 40), "#FF9800", "#ffffff", 16),
+            'hard': badge("HARD", (100, 40), "#F44336", "#ffffff", 16),
+        })
         
         # Sound effects (we'll just prepare placeholders but not implement actual sounds)
         self.sounds = {
@@ -151,22 +3238,8 @@ class WordGuessingGame:
         }
 
     def _create_text_image(self, text, size, bg_color, text_color, font_size):
-        """Create a simple image with text for buttons/logos"""
-        img = Image.new('RGBA', size, bg_color)
-        from PIL import ImageDraw, ImageFont
-        draw = ImageDraw.Draw(img)
-        # Use default font if custom font not available
-        try:
-            font = ImageFont.truetype("Arial Bold", font_size)
-        except:
-            font = ImageFont.load_default()
-        
-        # Center text
-        text_width, text_height = draw.textsize(text, font=font) if hasattr(draw, 'textsize') else (size[0]-20, size[1]-10)
-        position = ((size[0]-text_width)/2, (size[1]-text_height)/2)
-        draw.text(position, text, fill=text_color, font=font)
-        
-        return ImageTk.PhotoImage(img)
+        """Create a simple image with text for buttons/logos, going through the badge cache"""
+        return load_text_badge(self.master, text, size, bg_color, text_color, font_size)
 
     def _setup_styles(self):
         # Overall theme
@@ -258,35 +3331,42 @@ class WordGuessingGame:
         return f'#{new_rgb[0]:02x}{new_rgb[1]:02x}{new_rgb[2]:02x}'
 
     def _init_game_state(self):
-        self.difficulty = None
-        self.word = None
-        self.hint = None
-        self.display_word = None
-        # total lifelines across the entire game
-        self.total_lifelines = 10
-# only one lifeline available per question
-        self.lifelines = 1
-        self.correct_streak = 0
-        self.wrong_streak = 0
-        self.timer_seconds = 30
-        self.timer_id = None
+        # Game rules and state live in the engine; the view only keeps widget state
+        self.engine = None
         self.total_questions = 10
-        self.current_question = 0
-        self.score = 0
-        self.used_words = set()
-        self.animations = AnimationEffects()
 
-    def clear_widgets(self):
-        for widget in self.master.winfo_children():
-            widget.destroy()
+    def show_screen(self, name, build):
+        """Switch to a screen, building it with build(frame) the first time it is shown"""
+        # Leaving a screen drops a start waiting on the word bank and any running game timers
+        self.timer.stop()
+        for attr in ('_pending_start', '_advance_id'):
+            after_id = getattr(self, attr)
+            if after_id:
+                self.master.after_cancel(after_id)
+                setattr(self, attr, None)
+        frame = self.screens.get(name)
+        if frame is None:
+            with TRACE.span('screen.build', screen=name):
+                frame = ttk.Frame(self.master, style='Game.TFrame')
+                build(frame)
+            self.screens[name] = frame
+        if self._current_screen is not frame:
+            if self._current_screen is not None:
+                self._current_screen.pack_forget()
+            frame.pack(fill='both', expand=True)
+            self._current_screen = frame
+        return frame
 
     def setup_start_menu(self):
-        self.clear_widgets()
-        
-        # Container frame with background
-        main_frame = ttk.Frame(self.master, style='Game.TFrame')
-        main_frame.pack(fill='both', expand=True)
-        
+        self.show_screen('start', self._build_start_menu)
+        self.load_status = self.start_load_status
+        self._update_load_status()
+        if self.store.saved_game:
+            self.resume_btn.pack(after=self.start_btn, ipadx=20, ipady=10, pady=10)
+        else:
+            self.resume_btn.pack_forget()
+
+    def _build_start_menu(self, main_frame):
         # Title with logo
         logo_label = ttk.Label(main_frame, image=self.images['logo'])
         logo_label.pack(pady=(80, 20))
@@ -306,6 +3386,15 @@ class WordGuessingGame:
             command=self.setup_difficulty_menu
         )
         start_btn.pack(ipadx=30, ipady=15, pady=10)
+        self.start_btn = start_btn
+
+        # Shown only while there is a saved game to go back to
+        self.resume_btn = ttk.Button(
+            button_frame, 
+            text="Resume Game", 
+            style='Secondary.TButton',
+            command=self.resume_game
+        )
         
         # Additional buttons
         how_to_btn = ttk.Button(
@@ -332,6 +3421,10 @@ class WordGuessingGame:
         )
         version_label.pack(side='bottom', pady=10)
 
+        # Word bank loading progress
+        self.start_load_status = ttk.Label(main_frame, text="", style='Feedback.Info.TLabel')
+        self.start_load_status.pack(side='bottom')
+
     def show_instructions(self):
         """Show game instructions in a popup"""
         instructions = tk.Toplevel(self.master)
@@ -364,16 +3457,18 @@ class WordGuessingGame:
 
     def exit_prompt(self):
         """Confirm before exiting"""
+        paused = self.timer.pause()
         if messagebox.askyesno("Exit Game", "Are you sure you want to exit the game?"):
             self.master.quit()
+        elif paused:
+            self.timer.resume()
 
     def setup_difficulty_menu(self):
-        self.clear_widgets()
-        
-        # Main frame
-        main_frame = ttk.Frame(self.master, style='Game.TFrame')
-        main_frame.pack(fill='both', expand=True)
-        
+        self.show_screen('difficulty', self._build_difficulty_menu)
+        self.load_status = self.difficulty_load_status
+        self._update_load_status()
+
+    def _build_difficulty_menu(self, main_frame):
         # Title
         ttk.Label(main_frame, text="Select Difficulty", style='Header.TLabel').pack(pady=40)
         
@@ -408,18 +3503,74 @@ class WordGuessingGame:
         ttk.Button(main_frame, text="← Back", style='Secondary.TButton', 
                   command=self.setup_start_menu).pack(pady=30)
 
-    def start_game(self, difficulty):
+        # Word bank loading progress
+        self.difficulty_load_status = ttk.Label(main_frame, text="", style='Feedback.Info.TLabel')
+        self.difficulty_load_status.pack()
+
+    def resume_game(self):
+        saved = self.store.saved_game
+        if saved:
+            self.start_game(saved['difficulty'], saved)
+
+    def start_game(self, difficulty, saved=None):
+        max_depth = DIFFICULTY_SETTINGS[difficulty]['max_depth']
+        if self._pending_start:
+            self.master.after_cancel(self._pending_start)
+            self._pending_start = None
+        if self.datasource.load_error:
+            messagebox.showerror("Word Bank", f"Couldn't load the word bank: {self.datasource.load_error}")
+            return
+        if not self.datasource.ready_for(max_depth):
+            # Not enough of the word bank has streamed in yet; try again shortly
+            self.load_status.config(text=f"Loading word bank for {difficulty}... {self.datasource.progress():.0%}")
+            self._pending_start = self.master.after(100, lambda: self.start_game(difficulty, saved))
+            return
+        try:
+            rule = self.datasource.selection_rule(difficulty)
+        except ValueError as e:
+            messagebox.showerror("Word Bank", f"Can't start a game on {difficulty}: {e}")
+            return
+        if rule is not None and self.datasource.buckets(wait=False) is None:
+            # Sort the bank into length and difficulty buckets off the UI thread, then start
+            if not (self._buckets_thread and self._buckets_thread.is_alive()):
+                self._buckets_thread = threading.Thread(target=self.datasource.buckets, daemon=True,
+                                                        name='word-buckets')
+                self._buckets_thread.start()
+            self.load_status.config(text=f"Sorting word bank for {difficulty}...")
+            self._pending_start = self.master.after(100, lambda: self.start_game(difficulty, saved))
+            return
         self._init_game_state()
-        self.difficulty = difficulty
-        self.lifelines = {"Easy": 2, "Medium": 1, "Hard": 1}[difficulty]
-        self.clear_widgets()
-        self.setup_game_widgets()
+        engine = GameEngine.restore(saved) if saved else GameEngine(difficulty, self.total_questions)
+        try:
+            # Every word of the game is chosen now, so a bank that can't fill it is refused up front
+            plan = self.datasource.plan_session(difficulty, engine.total_questions - engine.current_question,
+                                                engine.used_words)
+        except ValueError as e:
+            messagebox.showerror("Word Bank", f"Can't start a game on {difficulty}: {e}")
+            return
+        self.engine = engine
+        self.prefetcher.start(difficulty, words=plan)
+        self.show_screen('game', self.setup_game_widgets)
+        self._reset_game_widgets()
         self.next_word()
 
-    def setup_game_widgets(self):
+    def _reset_game_widgets(self):
+        """Put the reused game screen back into its starting state for a new game"""
+        engine = self.engine
+        self.difficulty_badge.config(image=self.images[engine.difficulty.lower()])
+        self.question_counter.config(text=f"Word 1/{engine.total_questions}")
+        self.progress_bar['value'] = 0
+        self.score_label.config(text=f"Score: {engine.score}")
+        self.hint_label.config(text="Loading...")
+        self.word_label.config(text="")
+        self.timer_label.config(text="Time: 30s", foreground='')
+        self.feedback_label.config(text="", style='Feedback.Info.TLabel')
+        self.lifeline_btn.config(text=f"Reveal Letter ({engine.lifelines})")
+        self.entry.focus_set()
+
+    def setup_game_widgets(self, game_frame):
         # Main container
-        self.game_frame = ttk.Frame(self.master, style='Game.TFrame')
-        self.game_frame.pack(fill='both', expand=True)
+        self.game_frame = game_frame
         
         # Header with game info
         header_frame = ttk.Frame(self.game_frame, style='Game.TFrame')
@@ -428,8 +3579,8 @@ class WordGuessingGame:
         # Left side: Difficulty badge
         left_frame = ttk.Frame(header_frame, style='Game.TFrame')
         left_frame.pack(side='left')
-        diff_img = self.images[self.difficulty.lower()]
-        ttk.Label(left_frame, image=diff_img).pack(side='left', padx=5)
+        self.difficulty_badge = ttk.Label(left_frame)
+        self.difficulty_badge.pack(side='left', padx=5)
         
         # Center: Progress info
         center_frame = ttk.Frame(header_frame, style='Game.TFrame')
@@ -437,7 +3588,7 @@ class WordGuessingGame:
         
         self.question_counter = ttk.Label(
             center_frame, 
-            text=f"Word 1/{self.total_questions}", 
+            text="", 
             style='Info.TLabel'
         )
         self.question_counter.pack(pady=5)
@@ -458,7 +3609,7 @@ class WordGuessingGame:
         
         self.score_label = ttk.Label(
             right_frame, 
-            text=f"Score: {self.score}", 
+            text="", 
             style='Score.TLabel'
         )
         self.score_label.pack(padx=5)
@@ -502,7 +3653,6 @@ class WordGuessingGame:
         self.entry = ttk.Entry(input_frame, font=('Verdana', 18), width=25, justify='center')
         self.entry.pack(side='left', padx=10, ipady=5, expand=True)
         self.entry.bind('<Return>', lambda e: self.check_answer())
-        self.entry.focus_set()  # Auto-focus on entry
         
         # Submit button
         self.submit_btn = ttk.Button(
@@ -520,7 +3670,7 @@ class WordGuessingGame:
         # Lifeline button
         self.lifeline_btn = ttk.Button(
             controls_frame, 
-            text=f"Reveal Letter ({self.lifelines})", 
+            text="", 
             style='Primary.TButton',
             command=self.use_lifeline
         )
@@ -555,210 +3705,228 @@ class WordGuessingGame:
 
     def confirm_exit_game(self):
         """Ask before returning to main menu"""
+        # The clock stops while the question is on screen
+        paused = self.timer.pause()
         if messagebox.askyesno("Exit Game", "Are you sure you want to return to the main menu?\nYour progress will be lost."):
+            self.prefetcher.cancel()
+            self.store.record('clear_save')
             self.setup_start_menu()
+        elif paused:
+            self.timer.resume()
 
+    @traced('game.next_word')
     def next_word(self):
-        if self.current_question >= self.total_questions:
+        engine = self.engine
+        if not engine.next_question():
             return self.end_game()
+        TRACE.flush()
         
-        # Clean up previous timer if exists
-        if self.timer_id:
-            self.master.after_cancel(self.timer_id)
-            self.timer_id = None
+        # Clean up previous timer and a pending auto-advance if they exist
+        self.timer.stop()
+        if self._advance_id:
+            self.master.after_cancel(self._advance_id)
+            self._advance_id = None
             
-        self.current_question += 1
-        self.question_counter.config(text=f"Word {self.current_question}/{self.total_questions}")
-        self.progress_bar['value'] = (self.current_question - 1) / self.total_questions * 100
+        self.question_counter.config(text=f"Word {engine.current_question}/{engine.total_questions}")
+        self.progress_bar['value'] = (engine.current_question - 1) / engine.total_questions * 100
         
         # Reset UI elements
         self.entry.delete(0, tk.END)
         self.entry.config(state='normal')  # Re-enable entry for next word
         self.submit_btn.config(state='normal')  # Re-enable submit button
         self.feedback_label.config(text="")
-        self.hint_label.config(text="Loading new word...")
-        self.word_label.config(text="")
-        self.master.update()
-
-        # Update difficulty settings
-        max_depth = {"Easy": 1, "Medium": 2, "Hard": 3}[self.difficulty]
-        seeds = list(self.datasource.graph.keys())
-        random.shuffle(seeds)
-
-        def load():
-            sel = None
-            for _ in range(20):
-                seed = random.choice(seeds)
-                w = self.datasource.get_word(seed, max_depth=max_depth)
-                if w and w not in self.used_words:
-                    sel = (w, self.datasource.get_hint(w))
-                    break
-            if not sel:
-                sel = ('orange', 'A citrus fruit known for its vitamin C.')
-            self.master.after(0, lambda: self.set_word_and_hint(*sel))
 
-        threading.Thread(target=load, daemon=True).start()
+        if not self.prefetcher.take(self._on_word_ready):
+            # The worker is still behind; hold input until the word arrives
+            self.hint_label.config(text="Loading new word...")
+            self.word_label.config(text="")
+            self.entry.config(state='disabled')
+            self.submit_btn.config(state='disabled')
 
-    def set_word_and_hint(self, word, hint):
-        self.word = word
-        self.hint = hint
-        self.used_words.add(word)
-        
-        # Create masked word display
-        self.display_word = ['_' if c.isalpha() else c for c in word]
+    def _on_word_ready(self, pair):
+        if pair is None:
+            error = self.prefetcher.error
+            self.prefetcher.cancel()
+            if error:
+                messagebox.showerror("Word Bank", f"Couldn't load the next word: {error}")
+            else:
+                messagebox.showerror("Word Bank", "The word bank has run out of unused words for this difficulty.")
+            self.setup_start_menu()
+            return
+        self.entry.config(state='normal')
+        self.submit_btn.config(state='normal')
+        self.set_word_and_hint(*pair)
 
-        # --- auto-reveal 2 letters at start of each question ---
-        hidden_indices = [i for i, ch in enumerate(self.display_word) if ch == '_']
-        random.shuffle(hidden_indices)
-        for idx in hidden_indices[:2]:
-            self.display_word[idx] = self.word[idx]
-        # ---------------------------------------------------------
+    @traced('game.set_word_and_hint')
+    def set_word_and_hint(self, word, hint):
+        self.engine.set_word(word, hint, self.datasource.synonyms(word))
 
         # Add some animation effects for new word appearance
         self.hint_label.config(text=hint)
         
         # Show word with nice spacing
-        self.word_label.config(text=" ".join(self.display_word))
+        self.word_label.config(text=self.engine.masked_word)
         
-        # reset per-question lifeline from remaining pool
-        self.lifelines = 1 if self.total_lifelines > 0 else 0
         self.lifeline_btn.config(
-            text=f"Reveal Letter ({self.lifelines})",
-            state='normal' if self.lifelines else 'disabled'
+            text=f"Reveal Letter ({self.engine.lifelines})",
+            state='normal' if self.engine.lifelines else 'disabled'
         )
         
         # Start timer with appropriate time based on difficulty
         self.start_timer()
 
     def start_timer(self):
-        self.timer_seconds = {"Easy": 30, "Medium": 25, "Hard": 20}[self.difficulty]
-        self._countdown()
+        self.timer.start(self.engine)
 
-    def _countdown(self):
+    def _show_time_left(self, seconds):
         # Update timer display with color changes as time runs low
-        if self.timer_seconds <= 5:
-            self.timer_label.config(text=f"⏰ Time: {self.timer_seconds}s", foreground='#ff5555')
-        else:
-            self.timer_label.config(text=f"Time: {self.timer_seconds}s")
-            
-        if self.timer_seconds > 0:
-            self.timer_seconds -= 1
-            self.timer_id = self.master.after(1000, self._countdown)
+        if seconds <= 5:
+            self.timer_label.config(text=f"⏰ Time: {seconds}s", foreground='#ff5555')
         else:
-            # Time's up!
-            self.feedback_label.config(
-                text=f"⏰ Time's up! The word was: {self.word}", 
-                style='Feedback.Error.TLabel'
-            )
-            # Disable entry and submit
-            self.entry.config(state='disabled')
-            self.submit_btn.config(state='disabled')
+            self.timer_label.config(text=f"Time: {seconds}s")
+
+    def _on_time_up(self):
+        self._record_answer('timeout')
+        self.feedback_label.config(
+            text=f"⏰ Time's up! The word was: {self.engine.word}", 
+            style='Feedback.Error.TLabel'
+        )
+        # Disable entry and submit
+        self.entry.config(state='disabled')
+        self.submit_btn.config(state='disabled')
 
+    @traced('game.check_answer')
     def check_answer(self):
-        guess = self.entry.get().strip().lower()
-        if not guess:
+        result = self.engine.submit(self.entry.get())
+        if result == 'empty':
             self.feedback_label.config(
                 text="Please enter a guess!", 
                 style='Feedback.Info.TLabel'
             )
             return
+        if result is None:
+            return
             
         # Stop the timer
-        if self.timer_id:
-            self.master.after_cancel(self.timer_id)
-            self.timer_id = None
+        self.timer.stop()
+        self._record_answer(result)
             
-        # Check answer using fuzzy matching
-        sc = fuzz.ratio(guess, self.word)
-        
-        if sc >= 80:  # Close enough match
+        word = self.engine.word
+        if result == 'correct':
             # Correct answer!
-            self.score += max(5, self.timer_seconds // 2)  # Bonus points for speed
-            self.score_label.config(text=f"Score: {self.score}")
+            self.score_label.config(text=f"Score: {self.engine.score}")
             
             # Show success feedback with animation
             self.feedback_label.config(
-                text=f"✅ Correct! '{self.word}' was the answer!", 
+                text=f"✅ Correct! '{word}' was the answer!", 
                 style='Feedback.Success.TLabel'
             )
+            self.animations.fade_in(self.feedback_label)
             
             # Reveal the word
-            self.word_label.config(text=" ".join(self.word))
+            self.word_label.config(text=" ".join(word))
             
             # Disable input until next word
             self.entry.config(state='disabled')
             self.submit_btn.config(state='disabled')
             
             # Auto-proceed to next word after delay
-            self.master.after(2000, self.next_word)
+            self._advance_id = self.master.after(2000, self.next_word)
         else:
             # Wrong answer
             self.feedback_label.config(
-                text=f"❌ Incorrect! The word was: {self.word}", 
+                text=f"❌ Incorrect! {self._miss_feedback(self.entry.get().strip().lower(), word)}"
+                     f"The word was: {word}",
                 style='Feedback.Error.TLabel'
             )
+            self.animations.shake_widget(self.feedback_label)
             
             # Reveal the word
-            self.word_label.config(text=" ".join(self.word))
+            self.word_label.config(text=" ".join(word))
             
             # Disable input until next word
             self.entry.config(state='disabled')
             self.submit_btn.config(state='disabled')
 
-    def use_lifeline(self):
-        # only allow if overall pool and this question both have lifelines
-        if self.total_lifelines <= 0 or self.lifelines <= 0:
-            return
-
-        # Find a hidden letter to reveal
-        hidden_indices = [i for i, letter in enumerate(self.display_word) if letter == '_']
+    def _miss_feedback(self, guess, word):
+        """What a wrong guess was: nearly the answer, another bank word or a misspelling of one"""
+        if _edit_distance(guess, word, 2) <= max(1, typo_allowance(len(word))):
+            return "So close! "
+        if isinstance(self.datasource.index, ShardedIndex):
+            return ""  # looking the guess up would open every shard that doesn't have it
+        if self.datasource.index.lookup(guess) >= 0:
+            return f"'{guess}' is in the word bank, but it isn't this word. "
+        finder = self.datasource.word_finder(wait=False)
+        if finder is None and not (self._finder_thread and self._finder_thread.is_alive()):
+            # Build it off the UI thread; later wrong answers get the suggestions
+            self._finder_thread = threading.Thread(target=self.datasource.word_finder, daemon=True,
+                                                   name='word-finder')
+            self._finder_thread.start()
+        nearest = finder.nearest(guess, limit=1) if finder else []
+        if nearest:
+            return f"Did you mean '{nearest[0][1]}'? "
+        return ""
 
-        if hidden_indices:
-            # Choose a random hidden letter to reveal
-            idx = random.choice(hidden_indices)
-            self.display_word[idx] = self.word[idx]
+    def _record_answer(self, result):
+        """Log the answer to the player stats and save the game so it can be resumed"""
+        engine = self.engine
+        self.store.record('answer', difficulty=engine.difficulty, result=result,
+                          seconds=round(engine.elapsed(), 3))
+        if engine.current_question < engine.total_questions:
+            self.store.record('save', game=engine.snapshot())
 
-            # Update the display
-            self.word_label.config(text=" ".join(self.display_word))
+    def use_lifeline(self):
+        if self.engine.use_lifeline() is None:
+            return
 
-            # consume one from the overall pool and disable for this question
-            self.total_lifelines -= 1
-            self.lifelines = 0
-            self.lifeline_btn.config(
-                text=f"Reveal Letter ({self.lifelines})",
-                state='disabled'
-            )
+        # Update the display
+        self.word_label.config(text=self.engine.masked_word)
+        self.lifeline_btn.config(
+            text=f"Reveal Letter ({self.engine.lifelines})",
+            state='disabled'
+        )
 
 
     def end_game(self):
         """Show game over screen with stats"""
-        self.clear_widgets()
-        
-        # Container frame
-        end_frame = ttk.Frame(self.master, style='Game.TFrame')
-        end_frame.pack(fill='both', expand=True)
-        
+        self.prefetcher.cancel()
+        self.show_screen('end', self._build_end_screen)
+        engine = self.engine
+        self.store.record('game_end', difficulty=engine.difficulty, score=engine.score,
+                          won=engine.score > engine.total_questions*5)
+        stats = self.store.stats()
+        self.end_stats_label.config(
+            text=f"Games: {stats['games']}   Wins: {stats['wins']}   Losses: {stats['losses']}\n"
+                 f"Best streak: {stats['best_streak']}   Average answer: {stats['avg_answer_seconds']:.1f}s"
+        )
+        self.final_score_label.config(text=f"Final Score: {engine.score}/{engine.total_questions*10}")
+        performance_text = "Great job!" if engine.score > engine.total_questions*5 else " skill issue Keep practicing!"
+        self.performance_label.config(text=performance_text)
+        self.end_difficulty_label.config(text=f"Difficulty: {engine.difficulty}")
+        self.end_words_label.config(text=f"Words Played: {engine.total_questions}")
+
+    def _build_end_screen(self, end_frame):
         # Game over banner
         ttk.Label(end_frame, text="Game Complete!", style='Header.TLabel').pack(pady=(80, 20))
         
         # Score display with animation effect
-        score_display = ttk.Label(
-            end_frame, 
-            text=f"Final Score: {self.score}/{self.total_questions*10}", 
-            style='Title.TLabel'
-        )
-        score_display.pack(pady=20)
+        self.final_score_label = ttk.Label(end_frame, text="", style='Title.TLabel')
+        self.final_score_label.pack(pady=20)
         
         # Performance message
-        performance_text = "Great job!" if self.score > self.total_questions*5 else " skill issue Keep practicing!"
-        ttk.Label(end_frame, text=performance_text, style='Subtitle.TLabel').pack(pady=10)
+        self.performance_label = ttk.Label(end_frame, text="", style='Subtitle.TLabel')
+        self.performance_label.pack(pady=10)
         
         # Stats section
         stats_frame = ttk.Frame(end_frame, style='Game.TFrame')
         stats_frame.pack(pady=30)
         
-        ttk.Label(stats_frame, text=f"Difficulty: {self.difficulty}", style='Info.TLabel').pack(pady=5)
-        ttk.Label(stats_frame, text=f"Words Played: {self.total_questions}", style='Info.TLabel').pack(pady=5)
+        self.end_difficulty_label = ttk.Label(stats_frame, text="", style='Info.TLabel')
+        self.end_difficulty_label.pack(pady=5)
+        self.end_words_label = ttk.Label(stats_frame, text="", style='Info.TLabel')
+        self.end_words_label.pack(pady=5)
+        self.end_stats_label = ttk.Label(stats_frame, text="", style='Info.TLabel', justify='center')
+        self.end_stats_label.pack(pady=5)
         
         # Buttons
         button_frame = ttk.Frame(end_frame, style='Game.TFrame')
@@ -785,8 +3953,547 @@ class WordGuessingGame:
             command=self.exit_prompt
         ).pack(side='left', padx=10, ipadx=10, ipady=5)
 
+# --- Difficulty Calibration ---
+_calibration = {}
+
+
+def _calibration_init(filepath, trials, max_candidates, seed):
+    """Process pool initializer: open the bank (mmap pages are shared) and index its words"""
+    bank = FileBFS(filepath)
+    index = bank.index
+    by_letter = {}
+    for i in index.row_ids():
+        word = index.word(i)
+        for pos, ch in enumerate(word):
+            by_letter.setdefault((len(word), pos, ch), []).append(i)
+    _calibration.update(bank=bank, by_letter={k: frozenset(v) for k, v in by_letter.items()},
+                        trials=trials, max_candidates=max_candidates, seed=seed, tokens={})
+
+
+def _hint_tokens(i):
+    """Content words of a row's hint with the word itself masked out, as the player sees it"""
+    tokens = _calibration['tokens'].get(i)
+    if tokens is None:
+        index = _calibration['bank'].index
+        word = index.word(i)
+        masked = "it".join(_hint_segments(word, index.hint(i)))
+        tokens = frozenset(t for t in re.findall(r"[a-z]+", masked.lower()) if len(t) > 3)
+        _calibration['tokens'][i] = tokens
+    return tokens
+
+
+def _calibrate_chunk(ids):
+    """Estimate how often a player solves each word, as (word, difficulty, solve_rate) rows
+
+    Each trial reveals two random letters (three when the lifeline is used)
+    and the player guesses among bank words that fit those letters, favoring
+    words whose hints share vocabulary with the masked hint. A guess counts
+    when fuzzy_match would accept it.
+    """
+    bank, by_letter = _calibration['bank'], _calibration['by_letter']
+    index = bank.index
+    rows = []
+    for i in ids:
+        word = index.word(i)
+        rng = random.Random(f"{_calibration['seed']}:{word}")
+        hint = "it".join(_hint_segments(word, index.hint(i)))
+        tokens = _hint_tokens(i)
+        if word in tokens or re.search(r'\b' + re.escape(word) + r'\b', hint.lower()):
+            rows.append((word, 0.0, 1.0))  # the masked hint still gives the word away
+            continue
+        solved = 0.0
+        for _ in range(_calibration['trials']):
+            positions = rng.sample(range(len(word)), min(len(word), 3 if rng.random() < 0.5 else 2))
+            letter_sets = sorted((by_letter[(len(word), p, word[p])] for p in positions), key=len)
+            candidates = list(letter_sets[0].intersection(*letter_sets[1:]))
+            if len(candidates) > _calibration['max_candidates']:
+                candidates = rng.sample(candidates, _calibration['max_candidates'])
+                if i not in candidates:
+                    candidates[0] = i
+            weights = [1 + 3 * len(tokens & _hint_tokens(c)) for c in candidates]
+            accepted = sum(w for c, w in zip(candidates, weights) if fuzzy_match(index.word(c), word))
+            solved += accepted / sum(weights)
+        solve_rate = solved / _calibration['trials']
+        rows.append((word, round(1 - solve_rate, 4), round(solve_rate, 4)))
+    return rows
+
+
+def difficulty_path(filepath):
+    """Where calibrated difficulty scores for a word bank are stored"""
+    return os.path.splitext(filepath.rstrip(os.sep))[0] + '.difficulty.csv'
+
+
+def calibrate_difficulty(filepath, workers=None, trials=16, max_candidates=200, seed=0, chunk_size=256):
+    """Score every word's difficulty on a process pool and write them next to the bank"""
+    ids = list(FileBFS(filepath).index.row_ids())
+    chunks = [ids[i:i + chunk_size] for i in range(0, len(ids), chunk_size)]
+    from concurrent.futures import ProcessPoolExecutor
+    workers = workers or os.cpu_count()
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_calibration_init,
+                             initargs=(filepath, trials, max_candidates, seed)) as pool:
+        rows = [row for chunk in pool.map(_calibrate_chunk, chunks) for row in chunk]
+    elapsed = time.perf_counter() - start
+    path = difficulty_path(filepath)
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['word', 'difficulty', 'solve_rate'])
+        writer.writerows(sorted(rows))
+    return {'words': len(rows), 'workers': workers, 'seconds': elapsed, 'path': path}
+
+
+# --- Benchmarks ---
+STARTUP_BUDGET_MS = 750
+
+
+def _write_synthetic_csv(path, n_words, degree, seed=0):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['word', 'hint', 'neighbors'])
+        for word, hint, neighbors in _synthetic_records(n_words, degree, seed):
+            writer.writerow([word, hint, ';'.join(neighbors)])
+
+
+def _bench_case(fn, inputs, memory=True):
+    """Run fn over inputs, returning throughput, latency percentiles and peak traced memory"""
+    latencies = []
+    clock = time.perf_counter
+    for item in inputs:
+        start = clock()
+        fn(item)
+        latencies.append(clock() - start)
+    latencies.sort()
+    result = {
+        'ops': len(latencies),
+        'ops_per_sec': len(latencies) / sum(latencies) if sum(latencies) else float('inf'),
+        'p50_us': latencies[len(latencies) // 2] * 1e6,
+        'p99_us': latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1e6,
+    }
+    if memory:
+        # Separate pass so tracing overhead never shows up in the latencies
+        import tracemalloc
+        tracemalloc.start()
+        for item in inputs[:200]:
+            fn(item)
+        result['peak_kib'] = tracemalloc.get_traced_memory()[1] / 1024
+        tracemalloc.stop()
+    return result
+
+
+def run_benchmarks(sizes=(1_000, 100_000, 1_000_000), degree=4, samples=2000, seed=0):
+    """Benchmark word bank loading, word selection, hints and answer checks on synthetic banks"""
+    import subprocess
+    import tempfile
+    import tracemalloc
+    rng = random.Random(seed)
+    report = {
+        'meta': {
+            'python': sys.version.split()[0],
+            'platform': sys.platform,
+            'degree': degree,
+            'samples': samples,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': {},
+    }
+    try:
+        report['meta']['commit'] = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        pass
+
+    for n_words in sizes:
+        cases = {}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'words.csv')
+            _write_synthetic_csv(path, n_words, degree, seed)
+            cases['init_cold'] = _bench_case(lambda _: FileBFS(path), [None], memory=False)
+            tracemalloc.start()
+            os.remove(path + '.idx')
+            FileBFS(path)
+            cases['init_cold']['peak_kib'] = tracemalloc.get_traced_memory()[1] / 1024
+            tracemalloc.stop()
+            cases['init_warm'] = _bench_case(lambda _: FileBFS(path), [None] * 20)
+
+            bank = FileBFS(path)
+            words = [bank.index.word(rng.randrange(n_words)) for _ in range(samples)]
+            for depth in (1, 2, 3):
+                bank.rings = RingCache(bank.index)
+                get_word = lambda w, d=depth: bank.get_word(w, max_depth=d)
+                cases[f'get_word_d{depth}_cold'] = _bench_case(get_word, words, memory=False)
+                cases[f'get_word_d{depth}_cached'] = _bench_case(get_word, words)
+            cases['get_hint'] = _bench_case(bank.get_hint, words)
+            cases['check_answer'] = _bench_case(lambda pair: fuzzy_match(*pair),
+                                                _typo_cases(words, samples, rng))
+            cases['word_finder_build'] = _bench_case(lambda _: WordFinder(bank.index), [None], memory=False)
+            finder = bank.word_finder()
+            cases['near_misses'] = _bench_case(finder.nearest, [_typo(w, rng) for w in words])
+            # What next_word's loader does for one question: draw a fresh word and its hint
+            sessions = [bank.iter_session(2, rng=rng) for _ in range(max(1, samples // 10))]
+            cases['next_word_load'] = _bench_case(next, [s for s in sessions for _ in range(10)])
+        report['results'][str(n_words)] = cases
+    return report
+
+
+def compare_benchmarks(old, new):
+    """Lines describing the throughput change of every case present in both reports"""
+    lines = []
+    for size, cases in new['results'].items():
+        for name, result in cases.items():
+            before = old.get('results', {}).get(size, {}).get(name)
+            if before:
+                change = result['ops_per_sec'] / before['ops_per_sec'] - 1
+                lines.append(f"{size:>9} {name:<24} {before['ops_per_sec']:>12,.0f} -> "
+                              f"{result['ops_per_sec']:>12,.0f} ops/s ({change:+.1%})")
+    return lines
+
+
+def measure_screen_transitions(word_file='words.csv', rounds=20):
+    """Time each screen switch of the desktop game, including Tk's layout pass, in milliseconds"""
+    import tempfile
+    data_dir = tempfile.TemporaryDirectory()  # the games it ends must not reach the player's stats
+    root = tk.Tk()
+    root.withdraw()
+    app = WordGuessingGame(root, word_file=word_file, store=GameStore(data_dir.name))
+    app.datasource.loaded.wait()
+    steps = [
+        ('start -> difficulty', app.setup_difficulty_menu),
+        ('difficulty -> game', lambda: app.start_game('Easy')),
+        ('game -> end', app.end_game),
+        ('end -> difficulty', app.setup_difficulty_menu),
+        ('difficulty -> start', app.setup_start_menu),
+    ]
+    timings = {name: [] for name, _ in steps}
+    try:
+        for _ in range(rounds):
+            for name, switch in steps:
+                start = time.perf_counter()
+                switch()
+                root.update_idletasks()
+                timings[name].append((time.perf_counter() - start) * 1000)
+    finally:
+        app.prefetcher.shutdown()
+        app.store.close()
+        root.destroy()
+        data_dir.cleanup()
+    return {name: {'p50_ms': sorted(t)[len(t) // 2], 'max_ms': max(t)} for name, t in timings.items()}
+
+
+def measure_startup(word_file='words.csv', runs=5, gui=False):
+    """Cold-start the game in fresh processes until it has its first word
+
+    Headless runs import the game, open the word bank and draw one word;
+    with gui=True they instead run until the first menu is drawn, which
+    needs a display. Returns wall times in milliseconds and, from one
+    extra run under -X importtime, the top-level imports that took longest.
+    """
+    import subprocess
+    cmd = [sys.executable, os.path.abspath(__file__), '--word-file', word_file, 'play',
+           '--exit-after-draw' if gui else '--first-word']
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        proc = subprocess.run(cmd, capture_output=True, text=True)
+        times.append((time.perf_counter() - start) * 1000)
+        if proc.returncode:
+            raise RuntimeError(f"game failed to start: {(proc.stderr.strip().splitlines() or ['no output'])[-1]}")
+    proc = subprocess.run([sys.executable, '-X', 'importtime'] + cmd[1:], capture_output=True, text=True)
+    imports = []
+    for line in proc.stderr.splitlines():
+        # "import time: self [us] | cumulative | package", nested imports indented under their parent
+        fields = line.split('|')
+        if line.startswith('import time:') and len(fields) == 3 and fields[1].strip().isdigit() \
+                and not fields[2].startswith('  '):
+            imports.append((fields[2].strip(), int(fields[1]) / 1000))
+    imports.sort(key=lambda item: -item[1])
+    times.sort()
+    return {'runs_ms': times, 'median_ms': times[len(times) // 2], 'imports': imports[:10]}
+
+
 # --- Run ---
-if __name__ == '__main__':
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Word Wizard: AI Guessing Game")
+    parser.add_argument('--word-file', default='words.csv', help="word bank CSV")
+    parser.add_argument('--trace', default=os.environ.get('WORD_WIZARD_TRACE'),
+                        help="append timing spans and counters as JSON lines to this file")
+    commands = parser.add_subparsers(dest='command')
+    play = commands.add_parser('play', help="start the game (default)")
+    play.add_argument('--exit-after-draw', action='store_true', help="quit once the first menu is drawn")
+    play.add_argument('--first-word', action='store_true', help="print the first word without a window and quit")
+    simulate = commands.add_parser('simulate', help="play games headlessly to balance difficulty")
+    simulate.add_argument('--games', type=int, default=1000)
+    simulate.add_argument('--difficulty', choices=list(DIFFICULTY_SETTINGS), default='Medium')
+    simulate.add_argument('--skill', type=float, default=0.7, help="chance the player knows the word")
+    rings = commands.add_parser('rings', help="precompute depth-ring candidates for every seed")
+    rings.add_argument('--depths', type=int, nargs='+', default=[1, 2, 3])
+    commands.add_parser('bench-match', help="benchmark the fuzzy answer matcher against fuzzywuzzy")
+    serve = commands.add_parser('serve', help="host many concurrent games over HTTP/JSON")
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=8765)
+    loadtest = commands.add_parser('loadtest', help="play many concurrent games against a server")
+    loadtest.add_argument('--host', default='127.0.0.1')
+    loadtest.add_argument('--port', type=int, help="existing server (default: spawn one on a free port)")
+    loadtest.add_argument('--sessions', type=int, default=2000)
+    loadtest.add_argument('--connections', type=int, default=200)
+    loadtest.add_argument('--difficulty', choices=list(DIFFICULTY_SETTINGS), default='Medium')
+    calibrate = commands.add_parser('calibrate', help="score word difficulty by simulated guessing")
+    calibrate.add_argument('--workers', type=int, help="processes to use (default: all cores)")
+    calibrate.add_argument('--trials', type=int, default=16, help="simulated rounds per word")
+    bench = commands.add_parser('bench', help="benchmark the word selection and answer checking hot paths")
+    bench.add_argument('--sizes', type=int, nargs='+', default=[1_000, 100_000, 1_000_000])
+    bench.add_argument('--degree', type=int, default=4, help="neighbors per synthetic word")
+    bench.add_argument('--samples', type=int, default=2000)
+    bench.add_argument('--output', default='bench-results.json')
+    bench.add_argument('--compare', help="earlier results JSON to compare against")
+    timer = commands.add_parser('timer-check', help="check countdown accuracy on a busy event loop")
+    timer.add_argument('--seconds', type=int, default=5)
+    timer.add_argument('--busy-ms', type=int, default=150, help="blocking work in every 230 ms")
+    screens = commands.add_parser('bench-screens', help="time the desktop game's screen transitions")
+    screens.add_argument('--rounds', type=int, default=20)
+    neighbors = commands.add_parser('build-neighbors', help="derive neighbor lists from hint and spelling similarity (needs NumPy)")
+    neighbors.add_argument('--output', help="word bank CSV to write (default: <bank>.neighbors.csv)")
+    neighbors.add_argument('-k', type=int, default=3, help="neighbors per word")
+    neighbors.add_argument('--dims', type=int, default=256, help="hashed feature dimensions")
+    neighbors.add_argument('--memory-mb', type=int, default=64, help="peak memory of each similarity block, counting its sort indices")
+    neighbors.add_argument('--compile', action='store_true', help="also build the compiled index")
+    buckets = commands.add_parser('buckets', help="show how many words each difficulty's selection rule can draw")
+    buckets.add_argument('--rule', type=json.loads, help='rule to try, e.g. \'{"lengths": [5, 7], "rarity": [0.5, 1]}\'')
+    compile_bank = commands.add_parser('compile-bank', help="validate and clean the word bank's neighbor graph")
+    compile_bank.add_argument('--output', help="cleaned CSV to write (default: <bank>.clean.csv)")
+    compile_bank.add_argument('--symmetric', action='store_true', help="add the reverse of every neighbor edge")
+    compile_bank.add_argument('--report', help="also save the report as JSON")
+    commands.add_parser('stats', help="show player stats and any saved game")
+    startup = commands.add_parser('startup', help="time cold startup to the first word against a budget")
+    startup.add_argument('--runs', type=int, default=5)
+    startup.add_argument('--budget-ms', type=float, default=STARTUP_BUDGET_MS,
+                         help="fail when the median startup exceeds this")
+    startup.add_argument('--gui', action='store_true', help="time up to the first drawn menu instead (needs a display)")
+    memory = commands.add_parser('memory', help="compare dict and compiled graph memory use")
+    memory.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args(argv)
+    if args.trace:
+        TRACE.enable(args.trace)
+
+    if args.command == 'simulate':
+        try:
+            result = simulate_games(FileBFS(args.word_file), args.games, args.difficulty, args.skill)
+        except ValueError as e:
+            parser.error(str(e))
+        print(f"{result['games']:,} {args.difficulty} games at {result['games_per_sec']:,.0f} games/s, "
+              f"mean score {result['mean_score']:.1f}, outcomes {result['outcomes']}")
+        return
+
+    if args.command == 'bench-match':
+        result = bench_fuzzy_match(list(FileBFS(args.word_file).graph))
+        print(f"fuzzy_match: {result['fuzzy_match_per_sec']:,.0f} checks/s")
+        if 'fuzz_ratio_per_sec' in result:
+            print(f"fuzz.ratio:  {result['fuzz_ratio_per_sec']:,.0f} checks/s "
+                  f"(speedup {result['fuzzy_match_per_sec'] / result['fuzz_ratio_per_sec']:.1f}x), "
+                  f"{result['disagreements']} of {result['pairs']:,} decisions differ")
+        return
+
+    if args.command == 'serve':
+        import asyncio
+
+        async def serve():
+            bank = FileBFS(args.word_file)
+            bank.watch()
+            server = await GameServer(bank).serve(args.host, args.port)
+            print(f"Serving Word Wizard on http://{args.host}:{args.port}", flush=True)
+            async with server:
+                await server.serve_forever()
+        asyncio.run(serve())
+        return
+
+    if args.command == 'loadtest':
+        import asyncio
+        import socket
+        import subprocess
+        port, child = args.port, None
+        if port is None:
+            with socket.socket() as sock:
+                sock.bind((args.host, 0))
+                port = sock.getsockname()[1]
+            child = subprocess.Popen([sys.executable, os.path.abspath(__file__), '--word-file', args.word_file,
+                                      'serve', '--host', args.host, '--port', str(port)],
+                                     stdout=subprocess.PIPE, text=True)
+            child.stdout.readline()  # wait for the server to start listening
+        try:
+            result = asyncio.run(run_load_test(args.host, port, args.sessions, args.connections, args.difficulty))
+        finally:
+            if child:
+                child.terminate()
+        print(f"{result['completed']:,}/{result['sessions']:,} games completed, {result['requests']:,} requests "
+              f"at {result['requests_per_sec']:,.0f}/s, p50 {result['p50_ms']:.1f} ms, "
+              f"p99 {result['p99_ms']:.1f} ms, {result['errors']} errors")
+        if result['errors'] or result['completed'] != args.sessions:
+            sys.exit(1)
+        return
+
+    if args.command == 'calibrate':
+        result = calibrate_difficulty(args.word_file, workers=args.workers, trials=args.trials)
+        print(f"Calibrated {result['words']:,} words with {result['workers']} workers "
+              f"in {result['seconds']:.1f}s -> {result['path']}")
+        return
+
+    if args.command == 'bench':
+        report = run_benchmarks(args.sizes, args.degree, args.samples)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"{'words':>9} {'case':<24} {'ops/s':>12} {'p50 us':>10} {'p99 us':>10} {'peak KiB':>10}")
+        for size, cases in report['results'].items():
+            for name, r in cases.items():
+                print(f"{size:>9} {name:<24} {r['ops_per_sec']:>12,.0f} {r['p50_us']:>10.1f} "
+                      f"{r['p99_us']:>10.1f} {r.get('peak_kib', 0):>10,.0f}")
+        if args.compare:
+            with open(args.compare, encoding='utf-8') as f:
+                print("\n".join(compare_benchmarks(json.load(f), report)))
+        print(f"Results saved to {args.output}")
+        return
+
+    if args.command == 'timer-check':
+        result = check_timer_accuracy(args.seconds, args.busy_ms)
+        print(f"{args.seconds}s countdown with {args.busy_ms} ms of every 230 ms blocked: "
+              f"timed out {result['timeout_late_ms']:.0f} ms late, worst redraw "
+              f"{result['worst_redraw_late_ms']:.0f} ms late; counting 1 s ticks would time out "
+              f"{result['tick_counter_late_ms']:.0f} ms late")
+        # Lateness is bounded by one blocked callback plus scheduling slack, never cumulative
+        if result['timeout_late_ms'] > args.busy_ms + 50:
+            sys.exit(1)
+        return
+
+    if args.command == 'bench-screens':
+        for name, r in measure_screen_transitions(args.word_file, args.rounds).items():
+            print(f"{name:<22} p50 {r['p50_ms']:7.2f} ms   max {r['max_ms']:7.2f} ms")
+        return
+
+    if args.command == 'build-neighbors':
+        try:
+            import numpy  # noqa: F401
+        except ImportError:
+            parser.error("build-neighbors needs NumPy: pip install numpy")
+        start = time.perf_counter()
+        output = args.output or os.path.splitext(args.word_file)[0] + '.neighbors.csv'
+        write_word_bank(output, build_neighbors(_iter_word_csv(args.word_file), args.k, args.dims, args.memory_mb))
+        if args.compile:
+            WordIndex.build(output)
+        print(f"Wrote {output} in {time.perf_counter() - start:.1f}s")
+        return
+
+    if args.command == 'compile-bank':
+        if not os.path.isfile(args.word_file):
+            parser.error("compile-bank works on a single CSV; shards resolve neighbors across files")
+        start = time.perf_counter()
+        rows, report = normalize_word_bank(_iter_word_csv(args.word_file), symmetric=args.symmetric)
+        output = args.output or os.path.splitext(args.word_file)[0] + '.clean.csv'
+        write_word_bank(output, rows())
+        elapsed = time.perf_counter() - start
+        print(f"{report['rows']:,} words, {report['edges']:,} edges kept -> {output} ({elapsed:.1f}s)")
+        print(f"  removed: {report['dangling_edges']:,} dangling, {report['self_loops']:,} self-loops, "
+              f"{report['duplicate_edges']:,} repeated edges, {report['duplicate_rows']:,} repeated rows")
+        if args.symmetric:
+            print(f"  added {report['reverse_edges_added']:,} reverse edges")
+        if report['top_dangling']:
+            print("  most referenced missing words: " + ", ".join(f"{w} ({c})" for w, c in report['top_dangling']))
+        print(f"  {report['components']:,} components, largest {report['largest_component']:,} words, "
+              f"{report['isolated_words']:,} isolated")
+        for difficulty, cov in report['coverage'].items():
+            print(f"  {difficulty:<7} depth {cov['depth']}: {cov['full_depth_seeds']:,}/{cov['sampled_seeds']:,} "
+                  f"seeds reach playable words at full depth, {cov['no_candidate_seeds']:,} reach none")
+            for label, key in (('full depth', 'full_depth_words'), ('shallower', 'shallower_words'),
+                               ('none', 'no_candidate_words')):
+                if cov[key]:
+                    more = f" and {len(cov[key]) - 8:,} more" if len(cov[key]) > 8 else ""
+                    print(f"    {label}: {', '.join(cov[key][:8])}{more}")
+        if args.report:
+            with open(args.report, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+        return
+
+    if args.command == 'stats':
+        store = GameStore(user_data_dir())
+        stats = store.stats()
+        print(f"Games {stats['games']} (wins {stats['wins']}, losses {stats['losses']}), "
+              f"answers {stats['answers']} (correct {stats['correct']}, wrong {stats['wrong']}, "
+              f"timeouts {stats['timeouts']}), best streak {stats['best_streak']}, "
+              f"average answer {stats['avg_answer_seconds']:.1f}s")
+        for difficulty, score in sorted(stats['best_scores'].items()):
+            print(f"  best {difficulty} score: {score}")
+        saved = store.saved_game
+        if saved:
+            print(f"Saved {saved['difficulty']} game: {saved['completed_questions']}/{saved['total_questions']} "
+                  f"words, score {saved['score']}")
+        store.close()
+        return
+
+    if args.command == 'startup':
+        result = measure_startup(args.word_file, args.runs, gui=args.gui)
+        for name, ms in result['imports']:
+            print(f"  import {name:<24} {ms:7.1f} ms")
+        runs = ", ".join(f"{ms:.0f}" for ms in result['runs_ms'])
+        print(f"Startup to first {'menu' if args.gui else 'word'}: median {result['median_ms']:.0f} ms (runs: {runs}), "
+              f"budget {args.budget_ms:.0f} ms")
+        if result['median_ms'] > args.budget_ms:
+            sys.exit(1)
+        return
+
+    if args.command == 'memory':
+        print(f"{'words':>10} {'dict layout':>14} {'compiled':>14} {'build peak':>14} {'ratio':>7}")
+        for row in memory_report(args.sizes):
+            print(f"{row['words']:>10,} {row['dict_bytes'] / 2**20:>11.1f} MB "
+                  f"{row['index_bytes'] / 2**20:>11.1f} MB {row['index_build_peak_bytes'] / 2**20:>11.1f} MB "
+                  f"{row['dict_bytes'] / row['index_bytes']:>6.1f}x")
+        return
+
+    if args.command == 'buckets':
+        bank = FileBFS(args.word_file)
+        start = time.perf_counter()
+        index = bank.buckets()
+        print(f"Indexed playable words in {time.perf_counter() - start:.2f}s")
+        try:
+            if args.rule:
+                check_selection_rule(args.rule)
+                rules = {'--rule': args.rule}
+            else:
+                rules = {d: bank.selection_rule(d) for d in DIFFICULTY_SETTINGS}
+        except ValueError as e:
+            parser.error(str(e))
+        for name, rule in rules.items():
+            if rule is None:
+                print(f"  {name:<7} BFS rings at depth {DIFFICULTY_SETTINGS[name]['max_depth']}")
+                continue
+            try:
+                count = index.count(rule)
+            except ValueError as e:
+                parser.error(str(e))
+            start = time.perf_counter()
+            drawn = sum(1 for _ in islice(index.sample(rule), 1000))
+            per_draw = (time.perf_counter() - start) / max(1, drawn) * 1e6
+            print(f"  {name:<7} {json.dumps(rule)}: {count:,} words, {per_draw:.1f} µs per draw")
+        return
+
+    if args.command == 'rings':
+        FileBFS(args.word_file).precompute_rings(depths=tuple(args.depths))
+        print(f"Wrote {args.word_file}.rings")
+        return
+
+    if getattr(args, 'first_word', False):
+        word, _ = next(FileBFS(args.word_file).session('Medium'))
+        print(word)
+        return
+
     root = tk.Tk()
-    app = WordGuessingGame(root, word_file='words.csv')
-    root.mainloop()
\ No newline at end of file
+    app = WordGuessingGame(root, word_file=args.word_file)
+    if getattr(args, 'exit_after_draw', False):
+        root.update()
+        app.prefetcher.shutdown()
+        app.store.close()
+        root.destroy()
+        return
+    root.mainloop()
+    app.store.close()
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file